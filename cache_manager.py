@@ -1,8 +1,16 @@
 import json
+import logging
 import os
 from datetime import datetime, timedelta
+from utils import update_json_file
 
 class CacheManager:
+    """JSON file caches, one file per cache type.
+
+    Worker processes may share the cache directory: updates are locked and
+    written atomically, so a reader never sees a half-written file.
+    """
+
     def __init__(self, cache_dir="cache", expiry_days=7):
         self.cache_dir = os.path.join(os.path.dirname(__file__), cache_dir)
         self.expiry_days = timedelta(days=expiry_days)
@@ -26,17 +34,9 @@ class CacheManager:
     def set(self, key, data, cache_type):
         cache_file = os.path.join(self.cache_dir, f"{cache_type}.json")
         try:
-            cache = {}
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    cache = json.load(f)
-            
-            cache[key] = {
+            update_json_file(cache_file, key, {
                 'timestamp': datetime.now().isoformat(),
                 'data': data
-            }
-            
-            with open(cache_file, 'w') as f:
-                json.dump(cache, f)
-        except Exception:
-            pass
+            })
+        except Exception as e:
+            logging.getLogger('osint.cache').warning("Could not update %s cache: %s", cache_type, e)
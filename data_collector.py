@@ -1,22 +1,32 @@
+import glob
 import json
 import os
-from datetime import datetime
-from urllib.parse import urlparse
+from datetime import datetime, timedelta
 from collections import defaultdict
+from phone_analyzer import canonical_key
+from url_dedup import canonicalize_url
+from records import AnalysisRecord, to_json, to_plain, url_domain
 
 class DataCollector:
+    # How long each stage's saved data stays fresh for incremental re-scans
+    stage_ttl = {
+        'phone': timedelta(days=30),
+        'location': timedelta(days=7),
+        'social': timedelta(days=1),
+        'web': timedelta(days=7)
+    }
+
     def __init__(self, output_dir="results"):
         self.output_dir = os.path.join(os.path.dirname(__file__), output_dir)
         os.makedirs(self.output_dir, exist_ok=True)
 
     def analyze_results(self, results):
-        """Analyze and categorize search results."""
+        """Analyze and categorize a SearchRecord into an AnalysisRecord."""
         categories = defaultdict(list)
         domains = defaultdict(int)
         
-        for url in results.get('search_results', []):
-            parsed = urlparse(url)
-            domain = parsed.netloc
+        for url in results.urls:
+            domain = url_domain(url)
             
             # Categorize URL
             if any(x in domain for x in ['linkedin', 'facebook', 'twitter']):
@@ -32,29 +42,117 @@ class DataCollector:
             
             domains[domain] += 1
         
-        return {
-            'categories': dict(categories),
-            'domain_frequency': dict(domains),
-            'total_results': len(results.get('search_results', [])),
-            'timestamp': datetime.now().isoformat()
-        }
+        return AnalysisRecord(
+            categories,
+            domains,
+            len(results.urls),
+            datetime.now().isoformat()
+        )
+
+    def save_results(self, phone_number, results, analysis, stages=None):
+        """Save results and analysis to file.
 
-    def save_results(self, phone_number, results, analysis):
-        """Save results and analysis to file."""
-        filename = f"results_{phone_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        ``stages`` optionally holds the other stages' output as
+        ``{stage: {'timestamp': ..., 'data': ...}}`` for incremental re-scans.
+        The web stage's data is ``results`` itself, so only its timestamp is
+        kept under ``stages``; without one the results count as fetched now.
+        """
+        phone_number = canonical_key(phone_number)
+        now = datetime.now()
+        filename = f"results_{phone_number}_{now.strftime('%Y%m%d_%H%M%S')}.json"
         filepath = os.path.join(self.output_dir, filename)
         
+        stages = dict(stages or {})
+        web = stages.pop('web', None)
+        stages['web'] = {'timestamp': web['timestamp'] if web else now.isoformat()}
+        
         data = {
             'phone_number': phone_number,
             'search_results': results,
             'analysis': analysis,
+            'stages': stages,
             'metadata': {
-                'timestamp': datetime.now().isoformat(),
-                'result_count': len(results.get('search_results', []))
+                'timestamp': now.isoformat(),
+                'result_count': len(results.urls)
             }
         }
         
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False, default=to_json)
         
         return filepath
+
+    @staticmethod
+    def stage_entry(data):
+        """Wrap a stage's output, in its JSON shape, with the time it was produced."""
+        return {'timestamp': datetime.now().isoformat(), 'data': to_plain(data)}
+
+    def load_latest(self, phone_number):
+        """Load the most recently saved result for a number, or None."""
+        phone_number = canonical_key(phone_number)
+        pattern = os.path.join(self.output_dir, f"results_{glob.escape(phone_number)}_*.json")
+        # Timestamps in the filenames sort chronologically
+        for filepath in sorted(glob.glob(pattern), reverse=True):
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception:
+                continue
+        return None
+
+    def stage_snapshot(self, saved):
+        """Return ``{stage: {'timestamp': ..., 'data': ...}}`` from a saved result."""
+        if not saved:
+            return {}
+        stages = dict(saved.get('stages', {}))
+        if saved.get('search_results'):
+            # Files written before the web stage had its own entry only carry
+            # the save time, which is when the web search ran
+            web = stages.get('web') or {'timestamp': saved['metadata']['timestamp']}
+            stages['web'] = {'timestamp': web['timestamp'], 'data': saved['search_results']}
+        else:
+            stages.pop('web', None)
+        return stages
+
+    def expired_stages(self, stages, now=None):
+        """Return the stages that are missing or older than their TTL."""
+        now = now or datetime.now()
+        expired = []
+        for stage, ttl in self.stage_ttl.items():
+            entry = stages.get(stage)
+            if not entry or now - datetime.fromisoformat(entry['timestamp']) >= ttl:
+                expired.append(stage)
+        return expired
+
+    def diff_results(self, previous, current):
+        """Compare two stage snapshots and return only what changed."""
+        def data(stages, stage):
+            return (stages.get(stage) or {}).get('data') or {}
+
+        old_urls = data(previous, 'web').get('search_results', [])
+        new_urls = data(current, 'web').get('search_results', [])
+        old_accounts = data(previous, 'social').get('social', {})
+        new_accounts = data(current, 'social').get('social', {})
+        old_location = data(previous, 'location')
+        new_location = data(current, 'location')
+
+        location_changes = {}
+        for field in ('country', 'carrier', 'city', 'latitude', 'longitude'):
+            if old_location.get(field) != new_location.get(field):
+                location_changes[field] = {'old': old_location.get(field), 'new': new_location.get(field)}
+
+        # Compare canonical forms: which variant of a URL was kept can differ
+        old_url_keys = {canonicalize_url(url) for url in old_urls}
+        new_url_keys = {canonicalize_url(url) for url in new_urls}
+        return {
+            'urls': {
+                'added': [url for url in new_urls if canonicalize_url(url) not in old_url_keys],
+                'removed': [url for url in old_urls if canonicalize_url(url) not in new_url_keys]
+            },
+            'accounts': {
+                'added': {k: v for k, v in new_accounts.items() if old_accounts.get(k) != v},
+                'removed': {k: v for k, v in old_accounts.items() if k not in new_accounts}
+            },
+            'location': location_changes,
+            'first_scan': not previous
+        }
@@ -1,5 +1,6 @@
-import phonenumbers
-from phonenumbers import geocoder, carrier, timezone
+from phone_analyzer import create_context
+from records import LocationRecord
+from utils import update_json_file, write_json_atomic
 from geopy.geocoders import Nominatim
 from geopy.extra.rate_limiter import RateLimiter
 import folium
@@ -20,8 +21,7 @@ class LocationTracker:
         """Initialize cache directory and file"""
         os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
         if not os.path.exists(self.cache_file):
-            with open(self.cache_file, 'w') as f:
-                json.dump({}, f)
+            write_json_atomic(self.cache_file, {})
 
     def _get_cached_location(self, phone_number):
         """Get cached location data if available and not expired"""
@@ -39,46 +39,48 @@ class LocationTracker:
     def _cache_location(self, phone_number, location_data):
         """Cache location data"""
         try:
-            with open(self.cache_file, 'r') as f:
-                cache = json.load(f)
-            cache[phone_number] = {
+            update_json_file(self.cache_file, phone_number, {
                 'timestamp': datetime.now().isoformat(),
                 'data': location_data
-            }
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache, f)
+            })
         except Exception as e:
             print(f"Cache error: {e}")
 
     def get_location_info(self, phone_number):
-        """Get detailed location information for a phone number."""
+        """Get detailed location information for a phone number.
+
+        Accepts a PhoneContext or a raw number; the cache is keyed on E.164.
+        """
+        context = create_context(phone_number)
+        if context is None:
+            return None
+
         # Check cache first
-        if cached_data := self._get_cached_location(phone_number):
-            return cached_data
+        if cached_data := self._get_cached_location(context.e164):
+            return LocationRecord.from_dict(cached_data)
 
         try:
-            parsed_number = phonenumbers.parse(phone_number)
-            country = geocoder.description_for_number(parsed_number, "en")
-            carrier_name = carrier.name_for_number(parsed_number, "en")
-            regions = timezone.time_zones_for_number(parsed_number)
+            country = context.country
+            carrier_name = context.carrier
+            regions = context.timezones
             
             # Get more detailed location using carrier info
             search_query = f"{carrier_name}, {country}" if carrier_name else country
             location = self.geocode(search_query)
             
             if location:
-                result = {
-                    "country": country,
-                    "carrier": carrier_name,
-                    "city": location.address,
-                    "latitude": location.latitude,
-                    "longitude": location.longitude,
-                    "regions": regions,
-                    "map_file": self._generate_map(location),
-                    "approximate": True,
-                    "timestamp": datetime.now().isoformat()
-                }
-                self._cache_location(phone_number, result)
+                result = LocationRecord(
+                    country=country,
+                    carrier=carrier_name,
+                    city=location.address,
+                    latitude=location.latitude,
+                    longitude=location.longitude,
+                    regions=regions,
+                    map_file=self._generate_map(location),
+                    approximate=True,
+                    timestamp=datetime.now().isoformat()
+                )
+                self._cache_location(context.e164, result.to_dict())
                 return result
             return None
         except Exception as e:
@@ -1,18 +1,26 @@
-from phone_analyzer import analyze_phone_number
+from phone_analyzer import analyze_phone_number, create_context, iter_number_range, canonical_key
 from web_searcher import find_related_info, WebSearcher
 from social_scanner import SocialScanner
 from location_tracker import LocationTracker
 from result_formatter import (display_results, display_phone_analysis, 
                             display_progress, display_social_results,
-                            display_location_info)
+                            display_location_info, display_changes)
 from colorama import init, Fore, Style
 from cache_manager import CacheManager
 from utils import setup_logging
 from tqdm import tqdm
 import logging
 import asyncio
+import argparse
 from data_collector import DataCollector
+from progress_journal import ProgressJournal
+from sharded_runner import run_sharded
+from work_queue import WorkQueue, run_queue_workers
+from url_dedup import UrlSeenSet
+from profiler import profile
+from records import PhoneRecord, LocationRecord, SocialRecord, SearchRecord
 from datetime import datetime
+from contextlib import nullcontext
 
 BANNER = f"""
 {Fore.RED}
@@ -34,74 +42,381 @@ def get_phone_number():
     print(f"\n{Fore.CYAN}Enter phone number with country code (e.g., +861xxxxxxxxx): {Style.RESET_ALL}", end="")
     return input()
 
-async def run_analysis(phone, cache_manager):
+async def run_analysis(phone, cache_manager, journal=None, rate_limiter=None, seen_urls=None):
+    """Run every analysis stage for one number.
+
+    With a ProgressJournal, stages already recorded for the number are
+    replayed from the journal instead of being run again, and each newly
+    completed stage is recorded as it finishes. ``rate_limiter`` overrides
+    the web searcher's own limiter, e.g. to share one across processes.
+    With a UrlSeenSet, URLs already reported for an earlier number in the
+    batch are left out of this number's results.
+    """
     logger = logging.getLogger('osint.main')
     collector = DataCollector()
     stages = ['phone', 'location', 'social', 'web']
     
+    context = create_context(phone)
+    if context is None:
+        raise ValueError(f"Could not parse phone number: {phone}")
+    phone = context.e164
+    completed = journal.completed_stages(phone) if journal else {}
+    
+    def record(stage, output):
+        if journal:
+            journal.record_stage(phone, stage, output)
+    
     try:
-        async with WebSearcher(cache_manager) as searcher:
+        async with WebSearcher(cache_manager, rate_limiter=rate_limiter, seen_urls=seen_urls) as searcher:
             with tqdm(total=len(stages), desc="Analysis Progress") as pbar:
                 try:
                     display_progress("Analyzing phone number")
-                    analysis = analyze_phone_number(phone)
+                    if 'phone' in completed:
+                        analysis = completed['phone'] and PhoneRecord.from_dict(completed['phone'])
+                    else:
+                        analysis = analyze_phone_number(context)
+                        record('phone', analysis)
                     if analysis:
                         display_phone_analysis(analysis)
-                        logger.info(f"Phone analysis completed for {phone}")
+                        logger.info("Phone analysis completed for %s", phone)
                     pbar.update(1)
                     
                     display_progress("Tracking location information")
-                    tracker = LocationTracker()
-                    location_info = tracker.get_location_info(phone)
+                    if 'location' in completed:
+                        location_info = completed['location'] and LocationRecord.from_dict(completed['location'])
+                    else:
+                        tracker = LocationTracker()
+                        location_info = tracker.get_location_info(context)
+                        record('location', location_info)
                     display_location_info(location_info)
-                    logger.info(f"Location tracking completed for {phone}")
+                    logger.info("Location tracking completed for %s", phone)
                     pbar.update(1)
                     
                     display_progress("Scanning social media and email accounts")
-                    scanner = SocialScanner()
-                    social_results = scanner.find_social_accounts(phone)
-                    email_results = scanner.find_email_accounts(phone)
-                    display_social_results(social_results, email_results)
-                    logger.info(f"Social media and email scanning completed for {phone}")
+                    if 'social' in completed:
+                        social = SocialRecord.from_dict(completed['social'])
+                    else:
+                        social = SocialScanner().scan(context)
+                        record('social', social)
+                    display_social_results(social)
+                    logger.info("Social media and email scanning completed for %s", phone)
                     pbar.update(1)
                     
                     display_progress("Searching for related information")
-                    search_results = await searcher.search_all_engines(phone)
+                    search_results = await searcher.search_all_engines(context)
+                    results_file = None
                     
-                    if search_results and isinstance(search_results, dict):
-                        analysis = collector.analyze_results(search_results)
-                        results_file = collector.save_results(phone, search_results, analysis)
-                        display_results(search_results, analysis)
-                        logger.info(f"Web search completed for {phone}. Results saved to {results_file}")
+                    if search_results and isinstance(search_results, SearchRecord):
+                        results_analysis = collector.analyze_results(search_results)
+                        stage_data = {
+                            'phone': collector.stage_entry(analysis),
+                            'location': collector.stage_entry(location_info),
+                            'social': collector.stage_entry(social)
+                        }
+                        results_file = collector.save_results(phone, search_results, results_analysis, stage_data)
+                        display_results(search_results, results_analysis)
+                        logger.info("Web search completed for %s. Results saved to %s", phone, results_file)
                     else:
                         logger.warning("No valid search results found")
-                        display_results({'search_results': [], 'search_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+                        display_results(SearchRecord((), datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
                     
+                    record('web', {'results_file': results_file})
+                    if journal:
+                        journal.mark_done(phone, results_file)
                     pbar.update(1)
+                    return results_file
                 except Exception as e:
-                    logger.error(f"Error during analysis: {e}")
+                    logger.error("Error during analysis: %s", e)
                     raise
     except Exception as e:
-        logger.error(f"Error during analysis: {e}")
+        logger.error("Error during analysis: %s", e)
         raise
     finally:
         # Cleanup code here if needed
         pass
 
+async def run_incremental(phone, cache_manager):
+    """Re-scan a number, refreshing only expired stages, and report what changed.
+
+    The number's last saved result is the baseline. Stages still within
+    their TTL are reused as saved; the rest are run again. A full snapshot
+    is saved for the next comparison and only the differences are displayed.
+    """
+    logger = logging.getLogger('osint.main')
+    collector = DataCollector()
+    context = create_context(phone)
+    if context is None:
+        raise ValueError(f"Could not parse phone number: {phone}")
+    phone = context.e164
+    
+    previous = collector.stage_snapshot(collector.load_latest(phone))
+    expired = collector.expired_stages(previous)
+    current = dict(previous)
+    failed = []
+    
+    def refresh(stage, output):
+        # A lookup that failed keeps the last good data as the baseline; the
+        # stage stays expired and is retried on the next scan
+        if output is None and stage in previous:
+            failed.append(stage)
+        else:
+            current[stage] = collector.stage_entry(output)
+    
+    if 'phone' in expired:
+        refresh('phone', analyze_phone_number(context))
+    if 'location' in expired:
+        refresh('location', LocationTracker().get_location_info(context))
+    if 'social' in expired:
+        refresh('social', SocialScanner().scan(context))
+    if 'web' in expired:
+        async with WebSearcher(cache_manager) as searcher:
+            search_results = await searcher.search_all_engines(context, use_cache=False)
+        if search_results is None and 'web' not in previous:
+            search_results = SearchRecord((), datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        refresh('web', search_results)
+    
+    changes = collector.diff_results(previous, current)
+    changes['refreshed'] = [stage for stage in expired if stage not in failed]
+    changes['failed'] = failed
+    if failed:
+        logger.warning("Incremental scan of %s could not refresh %s; kept previous data", phone, ', '.join(failed))
+    
+    if changes['refreshed']:
+        search_results = SearchRecord.from_dict(current['web']['data'])
+        stage_data = {stage: current[stage] for stage in ('phone', 'location', 'social', 'web')}
+        results_file = collector.save_results(phone, search_results, collector.analyze_results(search_results), stage_data)
+        logger.info("Incremental scan of %s refreshed %s. Results saved to %s", phone,
+                    ', '.join(changes['refreshed']), results_file)
+    
+    display_changes(phone, changes)
+    return changes
+
+async def run_watchlist(numbers, cache_manager):
+    """Incrementally re-scan every number in a watchlist."""
+    logger = logging.getLogger('osint.main')
+    scanned = 0
+    for number in numbers:
+        try:
+            await run_incremental(number, cache_manager)
+            scanned += 1
+        except Exception as e:
+            logger.error("Error during incremental scan of %s: %s", number, e)
+    return scanned
+
+async def run_batch(numbers, cache_manager, journal, seen_urls=None):
+    """Run the analysis pipeline over many numbers, resuming from the journal.
+
+    Numbers the journal marks as done are skipped; partially analyzed numbers
+    continue from their last completed stage.
+    """
+    logger = logging.getLogger('osint.main')
+    analyzed = skipped = 0
+    for number in numbers:
+        context = create_context(number)
+        if context is None:
+            continue
+        if journal.is_done(context.e164):
+            skipped += 1
+            continue
+        try:
+            await run_analysis(context, cache_manager, journal, seen_urls=seen_urls)
+            analyzed += 1
+        except Exception as e:
+            logger.error("Error during analysis of %s: %s", context.e164, e)
+    logger.info("Batch completed: %s analyzed, %s already done", analyzed, skipped)
+    return analyzed
+
+def run_sharded_batch(numbers, workers, journal_file=None):
+    """Analyze numbers across worker processes and print results in input order."""
+    count = 0
+    for number, results_file, error in run_sharded(numbers, workers, journal_file):
+        if error:
+            print(f"{Fore.RED}{number}: {error}{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.CYAN}{number}{Style.RESET_ALL}: {results_file or 'no search results'}")
+            count += 1
+    return count
+
+def display_queue_status(db_file):
+    """Print work queue counts followed by finished numbers in backlog order."""
+    work_queue = WorkQueue(db_file)
+    try:
+        for number, status, results_file, error in work_queue.results():
+            if status == 'done':
+                print(f"{Fore.CYAN}{number}{Style.RESET_ALL}: {results_file or 'no search results'}")
+            else:
+                print(f"{Fore.RED}{number}: {error}{Style.RESET_ALL}")
+        stats = work_queue.stats()
+    finally:
+        work_queue.close()
+    print(f"\n{Fore.GREEN}Queue: " + ", ".join(f"{status} {count}" for status, count in sorted(stats.items())) + Style.RESET_ALL)
+
+def read_numbers(path):
+    """Lazily yield phone numbers from a file, one per line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+async def run_range_scan(start, end, cache_manager, journal=None, seen_urls=None):
+    """Run the analysis pipeline over every valid number between start and end."""
+    logger = logging.getLogger('osint.main')
+    scanned = 0
+    for context in iter_number_range(start, end):
+        if journal and journal.is_done(context.e164):
+            scanned += 1
+            continue
+        try:
+            await run_analysis(context, cache_manager, journal, seen_urls=seen_urls)
+        except Exception as e:
+            logger.error("Error during analysis of %s: %s", context.e164, e)
+        scanned += 1
+    logger.info("Range scan completed: %s valid numbers between %s and %s", scanned, start, end)
+    return scanned
+
+async def run_reparse(query, cache_manager):
+    """Rebuild search results for a query from stored responses, without network traffic."""
+    logger = logging.getLogger('osint.main')
+    searcher = WebSearcher(cache_manager)
+    queries = [canonical_key(query)] if query else searcher.response_store.queries()
+    reparsed = 0
+    for item in queries:
+        search_results = await searcher.reparse(item)
+        if not search_results:
+            logger.warning("No stored responses for %s", item)
+            continue
+        collector = DataCollector()
+        analysis = collector.analyze_results(search_results)
+        display_results(search_results, analysis)
+        reparsed += 1
+    logger.info("Reparsed stored responses for %s queries", reparsed)
+    return reparsed
+
+def run_async(coro, profiled=False):
+    """asyncio.run, optionally under the event-loop profiler."""
+    return asyncio.run(profile(coro) if profiled else coro)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Phone Number Intelligence Scanner")
+    parser.add_argument('--range', nargs=2, metavar=('START', 'END'),
+                        help="scan every valid number in a numbering block, e.g. +8613800000000 +8613800099999")
+    parser.add_argument('--reparse', nargs='?', const='', metavar='QUERY',
+                        help="rebuild search results from stored responses without refetching (all queries if omitted)")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="analyze every number listed in FILE (one per line)")
+    parser.add_argument('--journal', metavar='PATH',
+                        help="progress journal used to resume --batch/--range runs (default for --batch: FILE.journal.jsonl)")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="spread --batch/--range work across N processes")
+    parser.add_argument('--incremental', action='store_true',
+                        help="re-scan only expired stages since the last saved result and show just the changes (single number or --batch)")
+    parser.add_argument('--dedupe-urls', type=int, nargs='?', const=1000000, metavar='CAPACITY',
+                        help="in single-process --batch/--range runs, report each URL only for the first number that "
+                             "found it; CAPACITY is the expected number of distinct URLs (default 1000000)")
+    parser.add_argument('--queue', metavar='DB',
+                        help="run as a worker against a shared SQLite work queue")
+    parser.add_argument('--enqueue', metavar='FILE',
+                        help="with --queue: add the numbers in FILE to the queue and exit")
+    parser.add_argument('--queue-status', action='store_true',
+                        help="with --queue: print queue counts and finished results, then exit")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile single-process runs: report event-loop blocking and write flamegraph stacks to profiles/")
+    parser.add_argument('--log-json', action='store_true',
+                        help="write structured JSON log records")
+    parser.add_argument('--log-debug', type=float, metavar='RATE', default=None,
+                        help="enable debug logging, keeping this fraction (0-1) of debug records")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     print(BANNER)
-    logger = setup_logging()
+    logger = setup_logging(
+        queued=True,
+        structured=args.log_json,
+        level=logging.DEBUG if args.log_debug is not None else logging.INFO,
+        debug_sample_rate=args.log_debug if args.log_debug is not None else 1.0
+    )
     init()  # Initialize colorama
     cache_manager = CacheManager()
     
+    if args.reparse is not None:
+        try:
+            count = run_async(run_reparse(args.reparse, cache_manager), args.profile)
+            print(f"\n{Fore.GREEN}Reparse completed! {count} queries rebuilt.{Style.RESET_ALL}")
+        except Exception as e:
+            logger.error("Error during reparse: %s", e)
+            print(f"\n{Fore.RED}Error during reparse: {e}{Style.RESET_ALL}")
+        return
+    
+    if args.queue:
+        try:
+            if args.enqueue:
+                work_queue = WorkQueue(args.queue)
+                added = work_queue.enqueue(read_numbers(args.enqueue))
+                work_queue.close()
+                print(f"\n{Fore.GREEN}Queued {added} new numbers.{Style.RESET_ALL}")
+            elif args.queue_status:
+                display_queue_status(args.queue)
+            else:
+                run_queue_workers(args.queue, args.workers)
+                display_queue_status(args.queue)
+        except Exception as e:
+            logger.error("Error during queue run: %s", e)
+            print(f"\n{Fore.RED}Error during queue run: {e}{Style.RESET_ALL}")
+        return
+    
+    if args.incremental and args.batch:
+        try:
+            count = run_async(run_watchlist(read_numbers(args.batch), cache_manager), args.profile)
+            print(f"\n{Fore.GREEN}Incremental scan completed! {count} numbers checked.{Style.RESET_ALL}")
+        except Exception as e:
+            logger.error("Error during incremental scan: %s", e)
+            print(f"\n{Fore.RED}Error during incremental scan: {e}{Style.RESET_ALL}")
+        return
+    
+    if args.batch:
+        journal_file = args.journal or f"{args.batch}.journal.jsonl"
+        try:
+            if args.workers > 1:
+                count = run_sharded_batch(read_numbers(args.batch), args.workers, journal_file)
+            else:
+                seen_urls = UrlSeenSet(args.dedupe_urls) if args.dedupe_urls else None
+                with ProgressJournal(journal_file) as journal:
+                    count = run_async(run_batch(read_numbers(args.batch), cache_manager, journal, seen_urls), args.profile)
+            print(f"\n{Fore.GREEN}Batch completed! {count} numbers analyzed.{Style.RESET_ALL}")
+        except Exception as e:
+            logger.error("Error during batch: %s", e)
+            print(f"\n{Fore.RED}Error during batch: {e}{Style.RESET_ALL}")
+        return
+    
+    if args.range:
+        start, end = args.range
+        try:
+            if args.workers > 1:
+                numbers = (context.e164 for context in iter_number_range(start, end))
+                count = run_sharded_batch(numbers, args.workers, args.journal)
+            else:
+                seen_urls = UrlSeenSet(args.dedupe_urls) if args.dedupe_urls else None
+                with ProgressJournal(args.journal) if args.journal else nullcontext() as journal:
+                    count = run_async(run_range_scan(start, end, cache_manager, journal, seen_urls), args.profile)
+            print(f"\n{Fore.GREEN}Range scan completed! {count} numbers analyzed.{Style.RESET_ALL}")
+        except Exception as e:
+            logger.error("Error during range scan: %s", e)
+            print(f"\n{Fore.RED}Error during range scan: {e}{Style.RESET_ALL}")
+        return
+    
     phone = get_phone_number()
     if phone:
         try:
-            asyncio.run(run_analysis(phone, cache_manager))
+            if args.incremental:
+                run_async(run_incremental(phone, cache_manager), args.profile)
+            else:
+                run_async(run_analysis(phone, cache_manager), args.profile)
             logger.info("Analysis completed successfully")
             print(f"\n{Fore.GREEN}Analysis completed!{Style.RESET_ALL}")
         except Exception as e:
-            logger.error(f"Error during analysis: {e}")
+            logger.error("Error during analysis: %s", e)
             print(f"\n{Fore.RED}Error during analysis: {e}{Style.RESET_ALL}")
 
 if __name__ == "__main__":
@@ -1,35 +1,161 @@
+import re
 import phonenumbers
-from phonenumbers import carrier, geocoder, timezone
+from phonenumbers import carrier, geocoder, timezone, PhoneMetadata, PhoneNumber
+from records import PhoneRecord
 
-def analyze_phone_number(phone_number):
-    """Analyze a phone number and return detailed information."""
+class PhoneContext:
+    """Parsed phone number shared by every analysis stage.
+
+    The number is parsed once and all derived metadata is computed up front,
+    so stages and caches can rely on ``e164`` as the canonical key instead of
+    the raw user input.
+    """
+
+    def __init__(self, raw, parsed):
+        self.raw = raw
+        self.parsed = parsed
+        self.e164 = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        self.international = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+        self.national = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL)
+        self.country_code = parsed.country_code
+        self.national_number = parsed.national_number
+        self.country = geocoder.description_for_number(parsed, "en")
+        self.carrier = carrier.name_for_number(parsed, "en")
+        self.timezones = timezone.time_zones_for_number(parsed)
+        self.number_type = _get_number_type_description(phonenumbers.number_type(parsed))
+        self.is_valid = phonenumbers.is_valid_number(parsed)
+        self.is_possible = phonenumbers.is_possible_number(parsed)
+
+    @property
+    def digits(self):
+        """E.164 form without the leading '+'."""
+        return self.e164.lstrip('+')
+
+    def __str__(self):
+        return self.e164
+
+    def __repr__(self):
+        return f"PhoneContext({self.e164!r})"
+
+def create_context(phone_number):
+    """Parse a phone number once and return its PhoneContext, or None."""
+    if isinstance(phone_number, PhoneContext):
+        return phone_number
     try:
-        parsed_number = phonenumbers.parse(phone_number, None)
-        
-        if not phonenumbers.is_valid_number(parsed_number):
-            print("Invalid phone number format")
-            return None
-
-        return {
-            "country_code": parsed_number.country_code,
-            "national_number": parsed_number.national_number,
-            "country": geocoder.description_for_number(parsed_number, "en"),
-            "carrier": carrier.name_for_number(parsed_number, "en"),
-            "number_type": _get_number_type_description(phonenumbers.number_type(parsed_number)),
-            "is_valid": phonenumbers.is_valid_number(parsed_number),
-            "formatted": {
-                "international": phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
-                "national": phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.NATIONAL),
-                "e164": phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164)
-            },
-            "timezones": timezone.time_zones_for_number(parsed_number),
-            "possibility": phonenumbers.is_possible_number(parsed_number),
-            "region": geocoder.description_for_number(parsed_number, "en"),
-        }
+        return PhoneContext(phone_number, phonenumbers.parse(phone_number, None))
     except phonenumbers.NumberParseException as e:
         print(f"Error parsing phone number: {e}")
         return None
 
+def canonical_key(phone):
+    """Return the canonical cache key (E.164) for a context or raw number."""
+    if isinstance(phone, PhoneContext):
+        return phone.e164
+    try:
+        parsed = phonenumbers.parse(phone, None)
+        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    except phonenumbers.NumberParseException:
+        return phone
+
+def analyze_phone_number(phone_number):
+    """Analyze a phone number and return a PhoneRecord, or None if invalid.
+
+    Accepts either a raw number string or a PhoneContext.
+    """
+    context = create_context(phone_number)
+    if context is None:
+        return None
+
+    if not context.is_valid:
+        print("Invalid phone number format")
+        return None
+
+    return PhoneRecord.from_context(context)
+
+def iter_number_range(start, end, batch_size=10000):
+    """Lazily yield a PhoneContext for every valid number in [start, end].
+
+    Both endpoints must share a country code and leading-zero prefix
+    (e.g. Italian fixed lines, whose national number starts with 0). Candidates are generated in
+    fixed-size batches of national numbers, so memory stays constant however
+    large the block is. Each batch is first narrowed to the possible lengths
+    of the numbering plan, then matched against the plan's general pattern,
+    and only the survivors go through full validation.
+    """
+    first = create_context(start)
+    last = create_context(end)
+    if first is None or last is None:
+        return
+    if first.country_code != last.country_code:
+        raise ValueError("Range endpoints must share a country code")
+
+    leading_zeros = _leading_zeros(first.parsed)
+    if leading_zeros != _leading_zeros(last.parsed):
+        raise ValueError("Range endpoints must share a leading-zero prefix")
+
+    country_code = first.country_code
+    low, high = sorted((first.national_number, last.national_number))
+    lengths, pattern = _numbering_plan(country_code)
+    # Possible lengths count the leading zeros, which the integer does not hold
+    intervals = [
+        (10 ** (n - leading_zeros - 1), 10 ** (n - leading_zeros) - 1)
+        for n in sorted(lengths) if n > leading_zeros
+    ]
+    prefix = '0' * leading_zeros
+
+    for batch_start in range(low, high + 1, batch_size):
+        batch_end = min(batch_start + batch_size - 1, high)
+        for candidates in _prefilter_batch(batch_start, batch_end, intervals):
+            for national_number in candidates:
+                if pattern and not pattern.fullmatch(prefix + str(national_number)):
+                    continue
+                parsed = PhoneNumber(
+                    country_code=country_code,
+                    national_number=national_number,
+                    italian_leading_zero=True if leading_zeros else None,
+                    number_of_leading_zeros=leading_zeros if leading_zeros > 1 else None
+                )
+                if phonenumbers.is_valid_number(parsed) and phonenumbers.is_possible_number(parsed):
+                    yield PhoneContext(phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164), parsed)
+
+def _leading_zeros(parsed):
+    """Number of zeros in front of a parsed number's national number."""
+    if not parsed.italian_leading_zero:
+        return 0
+    return parsed.number_of_leading_zeros or 1
+
+def _prefilter_batch(batch_start, batch_end, intervals):
+    """Clip a batch to the allowed length intervals, yielding ranges."""
+    for low, high in intervals:
+        lo = max(batch_start, low)
+        hi = min(batch_end, high)
+        if lo <= hi:
+            yield range(lo, hi + 1)
+
+def _numbering_plan(country_code):
+    """Return the possible national number lengths and general pattern for a country code."""
+    regions = phonenumbers.region_codes_for_country_code(country_code)
+    metadata = []
+    for region in regions:
+        if region == phonenumbers.REGION_CODE_FOR_NON_GEO_ENTITY:
+            meta = PhoneMetadata.metadata_for_nongeo_region(country_code)
+        else:
+            meta = PhoneMetadata.metadata_for_region(region)
+        if meta is not None and meta.general_desc is not None:
+            metadata.append(meta.general_desc)
+
+    if not metadata:
+        return set(range(1, 18)), None
+
+    lengths = set()
+    patterns = []
+    for desc in metadata:
+        lengths.update(desc.possible_length or ())
+        if desc.national_number_pattern:
+            patterns.append(f"(?:{desc.national_number_pattern})")
+    pattern = re.compile("|".join(patterns)) if patterns else None
+    return lengths or set(range(1, 18)), pattern
+
 def _get_number_type_description(number_type):
     types = {
         0: "FIXED_LINE",
@@ -0,0 +1,245 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from asyncio import events
+from collections import Counter
+from datetime import datetime
+
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+_CALLBACK_FRAMES = {'asyncio/events.py:_run', 'profiler.py:timed_run'}
+
+class LoopProfiler:
+    """Sampling profiler that separates event-loop blocking from I/O waits.
+
+    A background thread samples every thread's stack each ``interval``
+    seconds. Event-loop thread samples are split into busy samples, where
+    code is running on the loop and blocking it, and idle samples, where the
+    loop sits in its selector waiting for I/O. Idle samples are attributed
+    to the await chains of pending tasks, followed from each task's
+    coroutine down to the innermost one it is suspended in. Independently,
+    every loop callback is timed, and callbacks slower than
+    ``slow_callback`` seconds are recorded with the innermost coroutine the
+    task was suspended in when the step resumed it.
+
+    Await chains are only read on the loop thread: after each task step the
+    stepped task's chain is recorded, and the sampler thread reads those
+    records under a lock instead of inspecting live tasks.
+
+    Start and stop it from the event loop thread, e.g. via ``profile()``.
+    """
+
+    def __init__(self, interval=0.005, slow_callback=0.1):
+        self.interval = interval
+        self.slow_callback = slow_callback
+        self.stacks = Counter()
+        self.busy_self = Counter()
+        self.busy_total = Counter()
+        self.slow_callbacks = Counter()
+        self.slow_callback_time = Counter()
+        self.busy_samples = 0
+        self.idle_samples = 0
+        self._loop = None
+        self._loop_thread = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._original_run = None
+        self._chains = {}
+        self._chains_lock = threading.Lock()
+        self._started = None
+        self.elapsed = 0.0
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._started = time.perf_counter()
+        current = asyncio.current_task()
+        for task in asyncio.all_tasks(self._loop):
+            if task is not current:
+                self._record_chain(task)
+        self._patch_handles()
+        if current is not None:
+            # Its chain is only meaningful once it suspends
+            self._loop.call_soon(self._record_chain, current)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name='osint-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._unpatch_handles()
+        with self._chains_lock:
+            self._chains.clear()
+        self.elapsed = time.perf_counter() - self._started
+
+    def _patch_handles(self):
+        profiler = self
+        original_run = events.Handle._run
+        self._original_run = original_run
+
+        def timed_run(handle):
+            task = _callback_task(handle)
+            if task is not None:
+                resumed = profiler._chains.get(task) or _await_chain(task.get_coro())
+            start = time.perf_counter()
+            try:
+                return original_run(handle)
+            finally:
+                duration = time.perf_counter() - start
+                if task is not None:
+                    profiler._record_chain(task)
+                if duration >= profiler.slow_callback:
+                    if task is not None and resumed:
+                        name = _innermost(resumed)
+                    else:
+                        name = _describe_callback(handle)
+                    profiler.slow_callbacks[name] += 1
+                    profiler.slow_callback_time[name] += duration
+
+        events.Handle._run = timed_run
+
+    def _unpatch_handles(self):
+        if self._original_run is not None:
+            events.Handle._run = self._original_run
+            self._original_run = None
+
+    def _record_chain(self, task):
+        # Runs on the loop thread, between task steps
+        chain = None if task.done() else _await_chain(task.get_coro())
+        with self._chains_lock:
+            if chain:
+                self._chains[task] = chain
+            else:
+                self._chains.pop(task, None)
+        return chain
+
+    def _sample_loop(self):
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == threading.get_ident():
+                    continue
+                frames = _frame_labels(frame)
+                if ident == self._loop_thread:
+                    self._sample_event_loop(frames)
+                else:
+                    self.stacks[';'.join([names.get(ident, str(ident))] + frames)] += 1
+
+    def _sample_event_loop(self, frames):
+        if frames and frames[-1].startswith('selectors.py:'):
+            self.idle_samples += 1
+            awaiting = self._await_stacks()
+            for stack in awaiting:
+                self.stacks[';'.join(['event-loop', '[awaiting I/O]'] + stack)] += 1
+            if not awaiting:
+                self.stacks['event-loop;[idle]'] += 1
+            return
+
+        self.busy_samples += 1
+        self.stacks[';'.join(['event-loop'] + frames)] += 1
+        # Only frames inside the running callback count; the runner above it is always present
+        run_index = max((i for i, f in enumerate(frames) if f in _CALLBACK_FRAMES), default=-1)
+        user_frames = [f for f in frames[run_index + 1:] if not f.startswith(('asyncio/', 'profiler.py:'))]
+        if user_frames:
+            self.busy_self[user_frames[-1]] += 1
+            for label in set(user_frames):
+                self.busy_total[label] += 1
+
+    def _await_stacks(self):
+        with self._chains_lock:
+            return list(self._chains.values())
+
+    def write_folded(self, path):
+        """Write collapsed stacks for flamegraph.pl, speedscope or inferno."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def report(self, top=20):
+        """Return a text report of the functions that block the event loop."""
+        loop_samples = self.busy_samples + self.idle_samples or 1
+        lines = [
+            f"Wall time: {self.elapsed:.2f}s",
+            f"Event loop busy (blocking): {self.busy_samples * 100 / loop_samples:.1f}% "
+            f"of {loop_samples} samples, idle/awaiting I/O: {self.idle_samples * 100 / loop_samples:.1f}%",
+            "",
+            f"Top {top} functions blocking the loop (inclusive samples, self samples):",
+        ]
+        for label, count in self.busy_total.most_common(top):
+            lines.append(f"  {count:6d} {self.busy_self[label]:6d}  {label}")
+        lines += ["", f"Callbacks slower than {self.slow_callback * 1000:.0f}ms (count, total seconds):"]
+        for name, count in self.slow_callbacks.most_common(top):
+            lines.append(f"  {count:6d} {self.slow_callback_time[name]:8.3f}  {name}")
+        if not self.slow_callbacks:
+            lines.append("  none")
+        return "\n".join(lines)
+
+async def profile(coro, output_dir="profiles", top=20, **options):
+    """Await coro under a LoopProfiler and write its folded stacks and report.
+
+    Returns the coroutine's result and prints the report and output paths.
+    """
+    profiler = LoopProfiler(**options)
+    profiler.start()
+    try:
+        return await coro
+    finally:
+        profiler.stop()
+        output_dir = os.path.join(os.path.dirname(__file__), output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        folded_file = os.path.join(output_dir, f"profile_{timestamp}.folded")
+        report_file = os.path.join(output_dir, f"profile_{timestamp}.txt")
+        profiler.write_folded(folded_file)
+        report = profiler.report(top)
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(report + "\n")
+        print(f"\n{report}\n\nFlamegraph stacks: {folded_file}\nReport: {report_file}")
+
+def _callback_task(handle):
+    task = getattr(getattr(handle, '_callback', None), '__self__', None)
+    return task if isinstance(task, asyncio.Task) else None
+
+def _describe_callback(handle):
+    callback = getattr(handle, '_callback', None)
+    return getattr(callback, '__qualname__', repr(callback))
+
+def _await_chain(coro):
+    """Labels of a suspended coroutine and every coroutine it awaits, outermost first."""
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, 'cr_frame', None) or getattr(coro, 'gi_frame', None) \
+            or getattr(coro, 'ag_frame', None)
+        if frame is None:
+            break
+        labels.append(_label(frame))
+        coro = getattr(coro, 'cr_await', None) or getattr(coro, 'gi_yieldfrom', None) \
+            or getattr(coro, 'ag_await', None)
+    return labels
+
+def _innermost(chain):
+    """The innermost label of an await chain outside asyncio itself."""
+    user = [label for label in chain if not label.startswith('asyncio/')]
+    return (user or chain)[-1]
+
+def _label(frame):
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_ASYNCIO_DIR):
+        filename = 'asyncio/' + os.path.basename(filename)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{code.co_name}"
+
+def _frame_labels(frame):
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+from records import to_json
+from utils import file_lock
+from datetime import datetime
+
+class ProgressJournal:
+    """Append-only journal of per-number stage progress for batch runs.
+
+    Every completed stage is written as one JSON line and flushed, so a
+    crashed run loses at most the stage that was in flight. Reopening the
+    same journal replays it, letting a restarted batch skip finished numbers
+    and resume the rest from their last completed stage. Several processes
+    may share one journal: replay and each append hold a lock on the file.
+    """
+
+    def __init__(self, journal_file, fsync=False):
+        self.journal_file = journal_file
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._state = {}
+        directory = os.path.dirname(journal_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(journal_file, 'a', encoding='utf-8')
+        with file_lock(self._file):
+            self._replay()
+
+    def _replay(self):
+        complete = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                complete += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._apply(entry)
+        # Cut off a torn final line from a crash, so the next entry starts
+        # on a line of its own; the stage it recorded is simply redone. Only
+        # an unterminated tail is cut: without a file lock another process
+        # may have appended whole lines since the read.
+        with open(self.journal_file, 'r+b') as f:
+            f.seek(complete)
+            tail = f.read()
+            if tail and b'\n' not in tail:
+                f.truncate(complete)
+
+    def _apply(self, entry):
+        number = entry['number']
+        if entry.get('stage') == 'done':
+            # Finished numbers are only ever skipped, so their stage outputs
+            # need not stay in memory
+            self._state[number] = {'stages': {}, 'done': True, 'output': entry.get('output')}
+            return
+        state = self._state.setdefault(number, {'stages': {}, 'done': False})
+        if not state['done']:
+            state['stages'][entry['stage']] = entry.get('output')
+
+    def _append(self, entry):
+        line = json.dumps(entry, ensure_ascii=False, default=to_json)
+        with self._lock:
+            with file_lock(self._file):
+                self._file.write(line + '\n')
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            self._apply(entry)
+
+    def record_stage(self, number, stage, output=None):
+        """Record that a stage finished for a number, with its output."""
+        self._append({
+            'number': number,
+            'stage': stage,
+            'output': output,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    def mark_done(self, number, output=None):
+        """Record that every stage finished for a number."""
+        self.record_stage(number, 'done', output)
+
+    def completed_stages(self, number):
+        """Return a mapping of completed stage name to its recorded output."""
+        return dict(self._state.get(number, {}).get('stages', {}))
+
+    def is_done(self, number):
+        return self._state.get(number, {}).get('done', False)
+
+    def output(self, number):
+        """Return the output recorded when a number was marked done, or None."""
+        return self._state.get(number, {}).get('output')
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,187 @@
+import abc
+import sys
+from urllib.parse import urlparse
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Record(abc.ABC):
+    """Base for compact result records.
+
+    Records keep their fields in ``__slots__`` and intern repeated strings
+    (countries, carriers, domains), so large batches do not hold a dict and
+    a separate copy of each name per number. ``to_dict``/``from_dict``
+    convert to and from the JSON shape the pipeline has always written.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def to_dict(self):
+        pass
+
+    @classmethod
+    @abc.abstractmethod
+    def from_dict(cls, data):
+        pass
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class PhoneRecord(Record):
+    __slots__ = ('country_code', 'national_number', 'country', 'carrier', 'number_type',
+                 'is_valid', 'international', 'national', 'e164', 'timezones', 'possibility')
+
+    def __init__(self, country_code, national_number, country, carrier, number_type,
+                 is_valid, international, national, e164, timezones, possibility):
+        self.country_code = country_code
+        self.national_number = national_number
+        self.country = _intern(country)
+        self.carrier = _intern(carrier)
+        self.number_type = _intern(number_type)
+        self.is_valid = is_valid
+        self.international = international
+        self.national = national
+        self.e164 = e164
+        self.timezones = tuple(_intern(tz) for tz in timezones)
+        self.possibility = possibility
+
+    @classmethod
+    def from_context(cls, context):
+        return cls(context.country_code, context.national_number, context.country, context.carrier,
+                   context.number_type, context.is_valid, context.international, context.national,
+                   context.e164, context.timezones, context.is_possible)
+
+    def to_dict(self):
+        return {
+            "country_code": self.country_code,
+            "national_number": self.national_number,
+            "country": self.country,
+            "carrier": self.carrier,
+            "number_type": self.number_type,
+            "is_valid": self.is_valid,
+            "formatted": {
+                "international": self.international,
+                "national": self.national,
+                "e164": self.e164
+            },
+            "timezones": list(self.timezones),
+            "possibility": self.possibility,
+            "region": self.country,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        formatted = data.get("formatted", {})
+        return cls(data.get("country_code"), data.get("national_number"), data.get("country"),
+                   data.get("carrier"), data.get("number_type"), data.get("is_valid"),
+                   formatted.get("international"),
+                   formatted.get("national"), formatted.get("e164"), data.get("timezones", ()),
+                   data.get("possibility"))
+
+class LocationRecord(Record):
+    __slots__ = ('country', 'carrier', 'city', 'latitude', 'longitude', 'regions',
+                 'map_file', 'approximate', 'timestamp')
+
+    def __init__(self, country, carrier, city, latitude, longitude, regions,
+                 map_file=None, approximate=True, timestamp=None):
+        self.country = _intern(country)
+        self.carrier = _intern(carrier)
+        self.city = _intern(city)
+        self.latitude = latitude
+        self.longitude = longitude
+        self.regions = tuple(_intern(region) for region in regions)
+        self.map_file = map_file
+        self.approximate = approximate
+        self.timestamp = timestamp
+
+    def to_dict(self):
+        return {
+            "country": self.country,
+            "carrier": self.carrier,
+            "city": self.city,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "regions": list(self.regions),
+            "map_file": self.map_file,
+            "approximate": self.approximate,
+            "timestamp": self.timestamp
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("country"), data.get("carrier"), data.get("city"), data.get("latitude"),
+                   data.get("longitude"), data.get("regions", ()), data.get("map_file"),
+                   data.get("approximate", True), data.get("timestamp"))
+
+class SocialRecord(Record):
+    __slots__ = ('accounts', 'emails')
+
+    def __init__(self, accounts, emails):
+        self.accounts = {_intern(platform): url for platform, url in accounts.items()}
+        self.emails = tuple(emails)
+
+    def to_dict(self):
+        return {'social': dict(self.accounts), 'email': list(self.emails)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('social', {}), data.get('email', ()))
+
+class SearchRecord(Record):
+    __slots__ = ('urls', 'search_time')
+
+    def __init__(self, urls, search_time):
+        self.urls = tuple(urls)
+        self.search_time = search_time
+
+    def to_dict(self):
+        return {'search_results': list(self.urls), 'search_time': self.search_time}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('search_results', ()), data.get('search_time'))
+
+class AnalysisRecord(Record):
+    __slots__ = ('categories', 'domain_frequency', 'total_results', 'timestamp')
+
+    def __init__(self, categories, domain_frequency, total_results, timestamp):
+        self.categories = {_intern(name): tuple(urls) for name, urls in categories.items()}
+        self.domain_frequency = {_intern(domain): count for domain, count in domain_frequency.items()}
+        self.total_results = total_results
+        self.timestamp = timestamp
+
+    def to_dict(self):
+        return {
+            'categories': {name: list(urls) for name, urls in self.categories.items()},
+            'domain_frequency': dict(self.domain_frequency),
+            'total_results': self.total_results,
+            'timestamp': self.timestamp
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('categories', {}), data.get('domain_frequency', {}),
+                   data.get('total_results', 0), data.get('timestamp'))
+
+def url_domain(url):
+    """Return a URL's network location as an interned string."""
+    return sys.intern(urlparse(url).netloc)
+
+def to_json(obj):
+    """``default`` hook for json.dump(s) that serializes records in the JSON shape."""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def to_plain(value):
+    """Return value in its plain JSON shape if it is a record, else unchanged."""
+    return value.to_dict() if isinstance(value, Record) else value
@@ -0,0 +1,135 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Rough per-row overhead of an index entry, on top of its text columns
+_ENTRY_OVERHEAD = 64
+
+class ResponseStore:
+    """Content-addressed store of raw search engine responses.
+
+    Bodies are gzip-compressed and stored once per SHA-256 digest, while a
+    SQLite index records every fetch by URL and time. Each fetch is one
+    appended row, so recording it does not rewrite the index, and worker
+    processes can share one store safely. The size cap
+    covers both the compressed blobs and the index rows; once
+    ``max_size_mb`` is exceeded the oldest fetches are dropped, together
+    with blobs no remaining fetch refers to.
+    """
+
+    def __init__(self, store_dir="cache/responses", max_size_mb=100):
+        self.store_dir = os.path.join(os.path.dirname(__file__), store_dir)
+        self.index_file = os.path.join(self.store_dir, "index.db")
+        self.max_size = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._conn = sqlite3.connect(self.index_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                engine TEXT,
+                query TEXT,
+                fetched_at TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_url ON entries (url, id);
+            CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+            CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL);
+            INSERT OR IGNORE INTO totals (id, size) VALUES (0, 0);
+        """)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.store_dir, f"{digest}.html.gz")
+
+    def _write_blob(self, digest, compressed):
+        # Several processes may share the store: write under a name unique to
+        # this writer and rename, so readers never see a partial blob
+        tmp_file = f"{self._blob_path(digest)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_file, self._blob_path(digest))
+
+    def put(self, url, engine, body, query=None):
+        """Store a raw response body and return its digest."""
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        entry_size = _ENTRY_OVERHEAD + len(url) + len(engine or '') + len(query or '')
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                if self._conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone() is None:
+                    compressed = gzip.compress(data)
+                    self._write_blob(digest, compressed)
+                    self._conn.execute("INSERT INTO blobs (digest, size) VALUES (?, ?)", (digest, len(compressed)))
+                    added += len(compressed)
+                self._conn.execute(
+                    "INSERT INTO entries (url, engine, query, fetched_at, digest, size) VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, engine, query, datetime.now().isoformat(), digest, entry_size)
+                )
+                added += entry_size
+                self._conn.execute("UPDATE totals SET size = size + ? WHERE id = 0", (added,))
+                self._enforce_size_cap()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return digest
+
+    def _enforce_size_cap(self):
+        total = self._conn.execute("SELECT size FROM totals WHERE id = 0").fetchone()[0]
+        while total > self.max_size:
+            oldest = self._conn.execute("SELECT id, digest, size FROM entries ORDER BY id LIMIT 1").fetchone()
+            if oldest is None:
+                break
+            entry_id, digest, entry_size = oldest
+            self._conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+            freed = entry_size
+            if self._conn.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone() is None:
+                row = self._conn.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+                if row:
+                    self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                    freed += row[0]
+                    try:
+                        os.remove(self._blob_path(digest))
+                    except OSError:
+                        pass
+            total -= freed
+            self._conn.execute("UPDATE totals SET size = size - ? WHERE id = 0", (freed,))
+
+    def get(self, digest):
+        """Return the decompressed body for a digest, or None."""
+        try:
+            with open(self._blob_path(digest), 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except Exception:
+            return None
+
+    def latest(self, url):
+        """Return the most recent stored entry for a URL, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, engine, query, fetched_at, digest FROM entries WHERE url = ? ORDER BY id DESC LIMIT 1",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('url', 'engine', 'query', 'fetched_at', 'digest'), row))
+
+    def queries(self):
+        """Return every distinct query with stored responses, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query FROM entries WHERE query IS NOT NULL GROUP BY query ORDER BY MIN(id)"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -23,16 +23,16 @@ def display_results(results, analysis=None):
         print(f"\n{Fore.YELLOW}No significant information found.{Style.RESET_ALL}")
         return
     
-    if 'search_time' in results:
-        print(f"{Fore.YELLOW}Search Time: {results['search_time']}{Style.RESET_ALL}\n")
+    if results.search_time:
+        print(f"{Fore.YELLOW}Search Time: {results.search_time}{Style.RESET_ALL}\n")
     
     if analysis:
         _print_section("📊 Result Analysis")
-        print(f"{Fore.WHITE}Total Results: {Fore.CYAN}{analysis['total_results']}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}Total Results: {Fore.CYAN}{analysis.total_results}{Style.RESET_ALL}")
         
         # Display categories
         _print_section("🏷️ Categories")
-        for category, urls in analysis['categories'].items():
+        for category, urls in analysis.categories.items():
             if urls:
                 print(f"\n{Fore.GREEN}{category.replace('_', ' ').title()}: {Style.RESET_ALL}")
                 for idx, url in enumerate(urls, 1):
@@ -40,18 +40,18 @@ def display_results(results, analysis=None):
         
         # Display top domains
         _print_section("🔝 Top Domains")
-        sorted_domains = sorted(analysis['domain_frequency'].items(), 
+        sorted_domains = sorted(analysis.domain_frequency.items(), 
                               key=lambda x: x[1], reverse=True)[:5]
         for domain, count in sorted_domains:
             print(f"{Fore.WHITE}{domain}: {Fore.CYAN}{count} results{Style.RESET_ALL}")
     
-    if 'search_results' in results:
+    if results.urls:
         _print_section("🔍 Search Results")
-        for idx, url in enumerate(results['search_results'], 1):
+        for idx, url in enumerate(results.urls, 1):
             print(f"{Fore.CYAN}{idx:02d}.{Style.RESET_ALL} {url}")
     
     # Show search statistics
-    total_results = len(results.get('search_results', []))
+    total_results = len(results.urls)
     print(f"\n{Fore.GREEN}Total Results Found: {total_results}{Style.RESET_ALL}")
 
 def display_phone_analysis(analysis):
@@ -65,47 +65,47 @@ def display_phone_analysis(analysis):
     
     # Basic information
     _print_section("📱 Basic Information")
-    print(f"{Fore.WHITE}Formatted Number: {Fore.CYAN}{analysis['formatted']['international']}")
-    print(f"{Fore.WHITE}Country: {Fore.CYAN}{analysis['country']}")
-    print(f"{Fore.WHITE}Carrier: {Fore.CYAN}{analysis['carrier'] or 'Unknown'}")
+    print(f"{Fore.WHITE}Formatted Number: {Fore.CYAN}{analysis.international}")
+    print(f"{Fore.WHITE}Country: {Fore.CYAN}{analysis.country}")
+    print(f"{Fore.WHITE}Carrier: {Fore.CYAN}{analysis.carrier or 'Unknown'}")
     
     # Technical details
     _print_section("🔧 Technical Details")
-    print(f"{Fore.WHITE}Number Type: {Fore.CYAN}{analysis['number_type']}")
-    print(f"{Fore.WHITE}Country Code: {Fore.CYAN}+{analysis['country_code']}")
-    print(f"{Fore.WHITE}National Number: {Fore.CYAN}{analysis['national_number']}")
+    print(f"{Fore.WHITE}Number Type: {Fore.CYAN}{analysis.number_type}")
+    print(f"{Fore.WHITE}Country Code: {Fore.CYAN}+{analysis.country_code}")
+    print(f"{Fore.WHITE}National Number: {Fore.CYAN}{analysis.national_number}")
     
     # Additional information
     _print_section("ℹ️ Additional Information")
-    print(f"{Fore.WHITE}Time Zones: {Fore.CYAN}{', '.join(analysis['timezones'])}")
+    print(f"{Fore.WHITE}Time Zones: {Fore.CYAN}{', '.join(analysis.timezones)}")
     
     # Validation status
     _print_section("✓ Validation Status")
-    valid_color = Fore.GREEN if analysis['is_valid'] else Fore.RED
-    possible_color = Fore.GREEN if analysis['possibility'] else Fore.RED
-    print(f"Valid Number: {valid_color}{'✓' if analysis['is_valid'] else '✗'}{Style.RESET_ALL}")
-    print(f"Possible Number: {possible_color}{'✓' if analysis['possibility'] else '✗'}{Style.RESET_ALL}")
+    valid_color = Fore.GREEN if analysis.is_valid else Fore.RED
+    possible_color = Fore.GREEN if analysis.possibility else Fore.RED
+    print(f"Valid Number: {valid_color}{'✓' if analysis.is_valid else '✗'}{Style.RESET_ALL}")
+    print(f"Possible Number: {possible_color}{'✓' if analysis.possibility else '✗'}{Style.RESET_ALL}")
 
 def display_progress(message):
     """Display a progress message."""
     print(f"\n{Fore.BLUE}⏳ {message}...{Style.RESET_ALL}")
 
-def display_social_results(social_results, email_results):
-    """Display social media and email results."""
+def display_social_results(social):
+    """Display a SocialRecord's social media and email results."""
     _print_header("Social Media & Email Analysis")
     
     # Display social media results
     _print_section("🌐 Social Media Accounts")
-    if social_results:
-        for platform, url in social_results.items():
+    if social.accounts:
+        for platform, url in social.accounts.items():
             print(f"{Fore.WHITE}{platform.title()}: {Fore.CYAN}{url}{Style.RESET_ALL}")
     else:
         print(f"{Fore.YELLOW}No social media accounts found.{Style.RESET_ALL}")
     
     # Display possible email accounts
     _print_section("📧 Possible Email Accounts")
-    if email_results:
-        for idx, email in enumerate(email_results, 1):
+    if social.emails:
+        for idx, email in enumerate(social.emails, 1):
             print(f"{Fore.WHITE}{idx}. {Fore.CYAN}{email}{Style.RESET_ALL}")
     else:
         print(f"{Fore.YELLOW}No potential email accounts found.{Style.RESET_ALL}")
@@ -117,15 +117,57 @@ def display_location_info(location_info):
         
     _print_header("📍 Location Information")
     
-    print(f"{Fore.WHITE}Country: {Fore.CYAN}{location_info['country']}{Style.RESET_ALL}")
-    print(f"{Fore.WHITE}Carrier Region: {Fore.CYAN}{location_info['carrier']}{Style.RESET_ALL}")
-    print(f"{Fore.WHITE}Detailed Location: {Fore.CYAN}{location_info['city']}{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}Country: {Fore.CYAN}{location_info.country}{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}Carrier Region: {Fore.CYAN}{location_info.carrier}{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}Detailed Location: {Fore.CYAN}{location_info.city}{Style.RESET_ALL}")
     print(f"\n{Fore.WHITE}GPS Coordinates:{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}Latitude: {location_info['latitude']}")
-    print(f"Longitude: {location_info['longitude']}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Latitude: {location_info.latitude}")
+    print(f"Longitude: {location_info.longitude}{Style.RESET_ALL}")
     
-    if location_info['map_file']:
-        print(f"\n{Fore.GREEN}Map generated: {location_info['map_file']}{Style.RESET_ALL}")
+    if location_info.map_file:
+        print(f"\n{Fore.GREEN}Map generated: {location_info.map_file}{Style.RESET_ALL}")
     
-    if location_info['approximate']:
+    if location_info.approximate:
         print(f"\n{Fore.YELLOW}Note: Location is approximate based on carrier and country data{Style.RESET_ALL}")
+
+def display_changes(phone_number, changes):
+    """Display only what changed since a number's last saved result."""
+    _print_header(f"Changes for {phone_number}")
+    
+    if changes.get('first_scan'):
+        print(f"{Fore.YELLOW}No previous result found; everything below is new.{Style.RESET_ALL}")
+    if changes.get('refreshed'):
+        print(f"{Fore.WHITE}Refreshed stages: {Fore.CYAN}{', '.join(changes['refreshed'])}{Style.RESET_ALL}")
+    elif not changes.get('failed'):
+        print(f"{Fore.WHITE}All stages are still fresh; nothing was re-scanned.{Style.RESET_ALL}")
+    if changes.get('failed'):
+        print(f"{Fore.RED}Could not refresh: {', '.join(changes['failed'])}; previous data kept.{Style.RESET_ALL}")
+    
+    found = False
+    
+    if changes['location']:
+        found = True
+        _print_section("📍 Location Changes")
+        for field, change in changes['location'].items():
+            print(f"{Fore.WHITE}{field.title()}: {Fore.RED}{change['old']}{Style.RESET_ALL} → {Fore.GREEN}{change['new']}{Style.RESET_ALL}")
+    
+    accounts = changes['accounts']
+    if accounts['added'] or accounts['removed']:
+        found = True
+        _print_section("🌐 Social Media Account Changes")
+        for platform, url in accounts['added'].items():
+            print(f"{Fore.GREEN}+ {platform.title()}: {url}{Style.RESET_ALL}")
+        for platform, url in accounts['removed'].items():
+            print(f"{Fore.RED}- {platform.title()}: {url}{Style.RESET_ALL}")
+    
+    urls = changes['urls']
+    if urls['added'] or urls['removed']:
+        found = True
+        _print_section("🔍 Search Result Changes")
+        for url in urls['added']:
+            print(f"{Fore.GREEN}+ {url}{Style.RESET_ALL}")
+        for url in urls['removed']:
+            print(f"{Fore.RED}- {url}{Style.RESET_ALL}")
+    
+    if not found:
+        print(f"\n{Fore.YELLOW}No changes since the last scan.{Style.RESET_ALL}")
@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from cache_manager import CacheManager
+from progress_journal import ProgressJournal
+from utils import SharedRateLimiter, setup_worker_logging, forward_worker_logs
+
+_DONE = None
+
+def run_sharded(numbers, workers=None, journal_file=None, calls_per_second=0.5):
+    """Analyze numbers across worker processes and yield results in input order.
+
+    Each worker runs its own event loop and HTTP connection pool. All workers
+    draw from one SharedRateLimiter, so the combined request rate stays at
+    ``calls_per_second``. Yields ``(number, results_file, error)`` tuples in
+    the order the numbers were given, regardless of which worker finished
+    first.
+    """
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context('spawn')
+    task_queue = context.Queue(maxsize=workers * 4)
+    result_queue = context.Queue()
+    log_queue = context.Queue()
+    rate_limiter = SharedRateLimiter(calls_per_second, context=context)
+    log_listener = forward_worker_logs(log_queue)
+
+    processes = [
+        context.Process(
+            target=_worker_main,
+            args=(task_queue, result_queue, log_queue, rate_limiter, journal_file),
+            daemon=True
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    feeder = threading.Thread(target=_feed, args=(numbers, task_queue, workers), daemon=True)
+    feeder.start()
+
+    try:
+        pending = {}
+        next_index = 0
+        finished = 0
+        while finished < workers:
+            try:
+                message = result_queue.get(timeout=1)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+            if message is _DONE:
+                finished += 1
+                continue
+            index, result = message
+            pending[index] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+        # Anything left behind a gap (a worker died mid-task) in input order
+        for index in sorted(pending):
+            yield pending[index]
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        log_listener.stop()
+
+def _feed(numbers, task_queue, workers):
+    for index, number in enumerate(numbers):
+        task_queue.put((index, number))
+    for _ in range(workers):
+        task_queue.put(_DONE)
+
+def _worker_main(task_queue, result_queue, log_queue, rate_limiter, journal_file):
+    setup_worker_logging(log_queue)
+    # Per-number reports from concurrent workers would interleave on the
+    # terminal; the parent prints the merged stream instead.
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        try:
+            asyncio.run(_worker_loop(task_queue, result_queue, rate_limiter, journal_file))
+        finally:
+            result_queue.put(_DONE)
+
+async def _worker_loop(task_queue, result_queue, rate_limiter, journal_file):
+    # Imported lazily: main imports this module
+    from main import run_analysis
+    from phone_analyzer import create_context
+
+    logger = logging.getLogger('osint.sharded')
+    cache_manager = CacheManager()
+    journal = ProgressJournal(journal_file) if journal_file else None
+    try:
+        while True:
+            task = await asyncio.to_thread(task_queue.get)
+            if task is _DONE:
+                break
+            index, number = task
+            results_file = None
+            error = None
+            context = create_context(number)
+            if context is None:
+                error = "Could not parse phone number"
+            elif journal and journal.is_done(context.e164):
+                number = context.e164
+                results_file = journal.output(number)
+            else:
+                number = context.e164
+                try:
+                    results_file = await run_analysis(context, cache_manager, journal, rate_limiter)
+                except Exception as e:
+                    logger.error("Error during analysis of %s: %s", number, e)
+                    error = str(e)
+            result_queue.put((index, (number, results_file, error)))
+    finally:
+        if journal:
+            journal.close()
@@ -3,6 +3,8 @@ from bs4 import BeautifulSoup
 import re
 import time
 import json
+from phone_analyzer import PhoneContext
+from records import SocialRecord
 
 class SocialScanner:
     def __init__(self):
@@ -18,10 +20,15 @@ class SocialScanner:
             'whatsapp': 'https://wa.me'
         }
         
+    def scan(self, phone_number):
+        """Return the social media and possible email accounts as a SocialRecord."""
+        return SocialRecord(self.find_social_accounts(phone_number),
+                            self.find_email_accounts(phone_number))
+    
     def find_social_accounts(self, phone_number):
         """Find social media accounts associated with the phone number."""
         results = {}
-        clean_number = phone_number.replace('+', '').replace(' ', '')
+        clean_number = _clean_number(phone_number)
         
         for platform, url in self.social_sites.items():
             try:
@@ -46,7 +53,7 @@ class SocialScanner:
             'outlook.com'
         ]
         
-        clean_number = phone_number.replace('+', '').replace(' ', '')
+        clean_number = _clean_number(phone_number)
         possible_emails = []
         
         # Generate possible email patterns
@@ -62,3 +69,9 @@ class SocialScanner:
                 possible_emails.append(f"{pattern}{service}")
         
         return possible_emails
+
+def _clean_number(phone_number):
+    """Digits-only form of a PhoneContext or raw number string."""
+    if isinstance(phone_number, PhoneContext):
+        return phone_number.digits
+    return phone_number.replace('+', '').replace(' ', '')
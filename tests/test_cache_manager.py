@@ -0,0 +1,28 @@
+import multiprocessing
+from cache_manager import CacheManager
+
+def _set_many(cache_dir, worker):
+    cache = CacheManager(cache_dir=cache_dir)
+    for i in range(50):
+        cache.set(f"+8491234{worker}{i:03d}", {"urls": [f"https://a.test/{worker}/{i}"]}, "search")
+
+def test_processes_share_one_cache_file(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_set_many, args=(str(tmp_path), worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    cache = CacheManager(cache_dir=str(tmp_path))
+    for worker in range(4):
+        for i in range(50):
+            assert cache.get(f"+8491234{worker}{i:03d}", "search") == {"urls": [f"https://a.test/{worker}/{i}"]}
+
+def test_unreadable_cache_file_is_replaced(tmp_path):
+    (tmp_path / "search.json").write_text('{"+84912345678": {"timest')
+    cache = CacheManager(cache_dir=str(tmp_path))
+    assert cache.get("+84912345678", "search") is None
+    cache.set("+84912345678", [1, 2], "search")
+    assert cache.get("+84912345678", "search") == [1, 2]
@@ -0,0 +1,48 @@
+import json
+from datetime import datetime, timedelta
+from data_collector import DataCollector
+from records import SearchRecord
+
+def _collector(tmp_path):
+    # output_dir is joined onto the module directory; an absolute path wins
+    return DataCollector(output_dir=str(tmp_path))
+
+def test_web_stage_keeps_its_own_timestamp(tmp_path):
+    collector = _collector(tmp_path)
+    results = SearchRecord(("https://a.test/",), "2026-01-01 00:00:00")
+    old = (datetime.now() - timedelta(days=10)).isoformat()
+    stages = {
+        'social': collector.stage_entry({'social': {}, 'email': []}),
+        'web': {'timestamp': old, 'data': results.to_dict()}
+    }
+    collector.save_results("+84912345678", results, collector.analyze_results(results), stages)
+
+    snapshot = collector.stage_snapshot(collector.load_latest("+84912345678"))
+    assert snapshot['web']['timestamp'] == old
+    assert snapshot['web']['data']['search_results'] == ["https://a.test/"]
+    assert 'web' in collector.expired_stages(snapshot)
+    assert 'social' not in collector.expired_stages(snapshot)
+
+def test_web_stage_defaults_to_save_time(tmp_path):
+    collector = _collector(tmp_path)
+    results = SearchRecord(("https://a.test/",), "2026-01-01 00:00:00")
+    collector.save_results("+84912345678", results, collector.analyze_results(results))
+    snapshot = collector.stage_snapshot(collector.load_latest("+84912345678"))
+    assert 'web' not in collector.expired_stages(snapshot)
+
+def test_old_files_fall_back_to_metadata_timestamp(tmp_path):
+    collector = _collector(tmp_path)
+    saved = {
+        'search_results': {'search_results': ["https://a.test/"], 'search_time': "x"},
+        'stages': {},
+        'metadata': {'timestamp': "2026-01-01T00:00:00"}
+    }
+    snapshot = collector.stage_snapshot(json.loads(json.dumps(saved)))
+    assert snapshot['web']['timestamp'] == "2026-01-01T00:00:00"
+
+def test_diff_ignores_trivial_url_variants(tmp_path):
+    collector = _collector(tmp_path)
+    previous = {'web': {'timestamp': "t", 'data': {'search_results': ["http://www.a.test/x/", "https://b.test/"]}}}
+    current = {'web': {'timestamp': "t", 'data': {'search_results': ["https://a.test/x", "https://c.test/"]}}}
+    changes = collector.diff_results(previous, current)
+    assert changes['urls'] == {'added': ["https://c.test/"], 'removed': ["https://b.test/"]}
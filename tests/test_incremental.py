@@ -0,0 +1,52 @@
+import asyncio
+import main
+from data_collector import DataCollector
+from records import LocationRecord, SocialRecord, SearchRecord
+
+class FailingTracker:
+    def get_location_info(self, context):
+        return None
+
+class Scanner:
+    def scan(self, context):
+        return SocialRecord({}, [])
+
+class FailingSearcher:
+    def __init__(self, cache_manager=None, **options):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def search_all_engines(self, query, use_cache=True):
+        return None
+
+def test_failed_refresh_keeps_previous_baseline(tmp_path, monkeypatch):
+    collector = DataCollector(output_dir=str(tmp_path))
+    monkeypatch.setattr(main, "DataCollector", lambda: collector)
+    monkeypatch.setattr(main, "LocationTracker", FailingTracker)
+    monkeypatch.setattr(main, "SocialScanner", Scanner)
+    monkeypatch.setattr(main, "WebSearcher", FailingSearcher)
+    monkeypatch.setattr(main, "display_changes", lambda phone, changes: None)
+
+    old = "2020-01-01T00:00:00"
+    results = SearchRecord(["https://a.test/"], "2020-01-01 00:00:00")
+    collector.save_results("+84912345678", results, collector.analyze_results(results), {
+        'phone': {'timestamp': old, 'data': None},
+        'location': {'timestamp': old, 'data': LocationRecord("VN", None, "Hanoi", 1.0, 2.0, ()).to_dict()},
+        'social': {'timestamp': old, 'data': {'social': {}, 'email': []}},
+        'web': {'timestamp': old}
+    })
+
+    changes = asyncio.run(main.run_incremental("+84912345678", None))
+    assert sorted(changes['failed']) == ['location', 'web']
+    assert changes['urls'] == {'added': [], 'removed': []}
+    assert changes['location'] == {}
+
+    saved = collector.load_latest("+84912345678")
+    assert saved['search_results']['search_results'] == ["https://a.test/"]
+    assert saved['stages']['web']['timestamp'] == old
+    assert saved['stages']['location']['data']['city'] == "Hanoi"
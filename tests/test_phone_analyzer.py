@@ -0,0 +1,21 @@
+import pytest
+from phone_analyzer import create_context, canonical_key, iter_number_range
+
+def test_context_is_canonical_e164():
+    spaced = create_context("+84 912 345 678")
+    compact = create_context("+84912345678")
+    assert spaced.e164 == compact.e164 == "+84912345678"
+    assert canonical_key("+84 912 345 678") == "+84912345678"
+
+def test_range_yields_only_valid_numbers_in_order():
+    numbers = [c.e164 for c in iter_number_range("+8613800000000", "+8613800000009")]
+    assert numbers == [f"+861380000000{i}" for i in range(10)]
+
+def test_range_keeps_italian_leading_zero():
+    numbers = [c.e164 for c in iter_number_range("+390612345670", "+390612345679")]
+    assert "+390612345678" in numbers
+    assert all(n.startswith("+3906") for n in numbers)
+
+def test_range_rejects_mixed_country_codes():
+    with pytest.raises(ValueError):
+        list(iter_number_range("+8613800000000", "+84912345678"))
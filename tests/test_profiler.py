@@ -0,0 +1,34 @@
+import asyncio
+import time
+from profiler import LoopProfiler
+
+def _block():
+    time.sleep(0.15)
+
+async def _fetch():
+    await asyncio.sleep(0.2)
+
+async def _search():
+    await _fetch()
+
+async def _work():
+    await asyncio.sleep(0.01)
+    _block()
+    await _search()
+
+def test_idle_time_follows_the_await_chain():
+    async def run():
+        profiler = LoopProfiler(interval=0.002)
+        profiler.start()
+        try:
+            await _work()
+        finally:
+            profiler.stop()
+        return profiler
+
+    profiler = asyncio.run(run())
+    idle = [stack for stack in profiler.stacks if '[awaiting I/O]' in stack]
+    assert any(stack.endswith('test_profiler.py:_search;test_profiler.py:_fetch;asyncio/tasks.py:sleep')
+               for stack in idle)
+    assert list(profiler.slow_callbacks) == ['test_profiler.py:_work']
+    assert profiler.busy_self['test_profiler.py:_block'] > 0
@@ -0,0 +1,62 @@
+import multiprocessing
+from progress_journal import ProgressJournal
+
+def test_replay_resumes_from_completed_stages(tmp_path):
+    journal_file = str(tmp_path / "journal.jsonl")
+    with ProgressJournal(journal_file) as journal:
+        journal.record_stage("+84912345678", "phone", {"valid": True})
+        journal.record_stage("+84912345678", "location", {"country": "VN"})
+        journal.record_stage("+84987654321", "phone", None)
+        journal.mark_done("+84987654321", "results.json")
+
+    with ProgressJournal(journal_file) as journal:
+        assert journal.completed_stages("+84912345678") == {
+            "phone": {"valid": True},
+            "location": {"country": "VN"}
+        }
+        assert not journal.is_done("+84912345678")
+        assert journal.is_done("+84987654321")
+        assert journal.output("+84987654321") == "results.json"
+
+def test_done_drops_stage_outputs(tmp_path):
+    with ProgressJournal(str(tmp_path / "journal.jsonl")) as journal:
+        journal.record_stage("+84912345678", "social", {"social": {"a": "b"}})
+        journal.mark_done("+84912345678", "results.json")
+        assert journal.completed_stages("+84912345678") == {}
+        assert journal.output("+84912345678") == "results.json"
+
+def test_torn_last_line_is_skipped(tmp_path):
+    journal_file = tmp_path / "journal.jsonl"
+    with ProgressJournal(str(journal_file)) as journal:
+        journal.record_stage("+84912345678", "phone", {"valid": True})
+    with open(journal_file, "a", encoding="utf-8") as f:
+        f.write('{"number": "+84912345678", "stage": "loca')
+
+    with ProgressJournal(str(journal_file)) as journal:
+        assert journal.completed_stages("+84912345678") == {"phone": {"valid": True}}
+        journal.record_stage("+84912345678", "location", {"country": "VN"})
+
+    with ProgressJournal(str(journal_file)) as journal:
+        assert set(journal.completed_stages("+84912345678")) == {"phone", "location"}
+
+def _record_many(journal_file, worker):
+    with ProgressJournal(journal_file) as journal:
+        for i in range(50):
+            # Larger than the write buffer, so a line takes several writes
+            journal.record_stage(f"+8491234{worker}{i:03d}", "social", {"page": "x" * 20000})
+            journal.mark_done(f"+8491234{worker}{i:03d}", "results.json")
+
+def test_processes_share_one_journal(tmp_path):
+    journal_file = str(tmp_path / "journal.jsonl")
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_record_many, args=(journal_file, worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    with ProgressJournal(journal_file) as journal:
+        assert all(journal.is_done(f"+8491234{worker}{i:03d}") for worker in range(4) for i in range(50))
+    with open(journal_file, encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 400
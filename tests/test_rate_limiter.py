@@ -0,0 +1,60 @@
+import asyncio
+from utils import AdaptiveRateLimiter
+
+def test_successes_ramp_up_rate_and_concurrency():
+    async def run():
+        limiter = AdaptiveRateLimiter(rate=1.0, burst=10, concurrency=2, increase=0.5)
+        for _ in range(4):
+            await limiter.acquire()
+            limiter.release(True, latency=0.1)
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.rate == 3.0
+    assert limiter.concurrency_limit == 3
+    assert limiter.in_flight == 0
+
+def test_concurrent_failures_cut_once():
+    async def run():
+        limiter = AdaptiveRateLimiter(rate=4.0, burst=10, concurrency=8, max_concurrency=8)
+        for _ in range(8):
+            await limiter.acquire()
+        # All eight were in flight when the first failure cut the limits
+        for _ in range(8):
+            limiter.release(False, latency=0.5)
+        after_event = (limiter.rate, limiter.concurrency)
+
+        await limiter.acquire()
+        limiter.release(False, latency=0.0)
+        return after_event, (limiter.rate, limiter.concurrency)
+
+    after_event, after_next = asyncio.run(run())
+    assert after_event == (2.0, 4.0)
+    assert after_next == (1.0, 2.0)
+
+def test_release_wakes_a_waiter():
+    async def run():
+        limiter = AdaptiveRateLimiter(rate=5.0, burst=10, concurrency=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        limiter.release(True, latency=0.1)
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 1
+
+    asyncio.run(run())
+
+def test_cancelled_waiter_does_not_hold_a_slot():
+    async def run():
+        limiter = AdaptiveRateLimiter(rate=5.0, burst=10, concurrency=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release(True, latency=0.1)
+        await asyncio.wait_for(limiter.acquire(), 1)
+        assert limiter.in_flight == 1
+
+    asyncio.run(run())
@@ -0,0 +1,19 @@
+import json
+import pytest
+from records import Record, PhoneRecord, SocialRecord, to_json
+
+def test_record_base_is_abstract():
+    with pytest.raises(TypeError):
+        Record()
+
+def test_social_record_roundtrip():
+    social = SocialRecord({"telegram": "https://t.me/84912345678"}, ["84912345678@gmail.com"])
+    data = json.loads(json.dumps(social, default=to_json))
+    assert data == {"social": {"telegram": "https://t.me/84912345678"}, "email": ["84912345678@gmail.com"]}
+    assert SocialRecord.from_dict(data) == social
+
+def test_phone_record_from_partial_dict():
+    record = PhoneRecord.from_dict({"country_code": 84, "formatted": {"e164": "+84912345678"}})
+    assert record.e164 == "+84912345678"
+    assert record.carrier is None
+    assert record.timezones == ()
@@ -0,0 +1,59 @@
+import multiprocessing
+import os
+from response_store import ResponseStore
+
+def test_put_and_latest_roundtrip(tmp_path):
+    store = ResponseStore(store_dir=str(tmp_path))
+    first = store.put("https://a.test/?q=1", "yandex", "<html>one</html>", "+84912345678")
+    second = store.put("https://a.test/?q=1", "yandex", "<html>two</html>", "+84912345678")
+    entry = store.latest("https://a.test/?q=1")
+    assert entry["digest"] == second != first
+    assert store.get(second) == "<html>two</html>"
+    assert store.queries() == ["+84912345678"]
+    assert store.latest("https://missing.test/") is None
+    store.close()
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    store = ResponseStore(store_dir=str(tmp_path))
+    for i in range(5):
+        store.put(f"https://a.test/?q={i}", "baidu", "<html>same</html>")
+    blobs = [name for name in os.listdir(tmp_path) if name.endswith(".html.gz")]
+    assert len(blobs) == 1
+    store.close()
+
+def test_size_cap_evicts_entries_even_with_shared_blobs(tmp_path):
+    # Entries pointing at one deduplicated blob still count against the cap
+    store = ResponseStore(store_dir=str(tmp_path), max_size_mb=0.01)
+    for i in range(1000):
+        store.put(f"https://a.test/?q={i}", "baidu", "<html>same</html>")
+    total = store._conn.execute("SELECT size FROM totals").fetchone()[0]
+    entries = store._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    assert total <= store.max_size
+    assert 0 < entries < 1000
+    assert store.latest("https://a.test/?q=999") is not None
+    assert store.latest("https://a.test/?q=0") is None
+    store.close()
+
+def _put_many(store_dir, worker, count):
+    store = ResponseStore(store_dir=store_dir)
+    for i in range(count):
+        store.put(f"https://a.test/?w={worker}&q={i}", "baidu", f"<html>{worker}-{i % 3}</html>", f"q{worker}")
+    store.close()
+
+def test_concurrent_processes_keep_every_entry(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_put_many, args=(str(tmp_path), worker, 30))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    store = ResponseStore(store_dir=str(tmp_path))
+    assert store._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 120
+    assert sorted(store.queries()) == ["q0", "q1", "q2", "q3"]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    store.close()
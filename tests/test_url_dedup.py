@@ -0,0 +1,33 @@
+from url_dedup import canonicalize_url, UrlSeenSet, unique_urls
+
+def test_trivial_variants_share_a_canonical_form():
+    variants = [
+        "https://www.Example.com/page/?b=2&a=1",
+        "http://example.com:80/page?a=1&b=2#top",
+        "https://example.com/page?a=1&b=2&utm_source=x&gclid=y",
+    ]
+    assert {canonicalize_url(url) for url in variants} == {"example.com/page?a=1&b=2"}
+
+def test_meaningful_differences_are_kept():
+    assert canonicalize_url("https://example.com:8443/page") != canonicalize_url("https://example.com/page")
+    assert canonicalize_url("https://example.com/page?id=1") != canonicalize_url("https://example.com/page?id=2")
+
+def test_seen_set_matches_canonical_variants():
+    seen = UrlSeenSet(capacity=1000)
+    assert seen.add("https://www.example.com/a/")
+    assert not seen.add("http://example.com/a?utm_medium=mail")
+    assert "https://example.com/a" in seen
+    assert "https://example.com/b" not in seen
+    assert seen.count == 1
+
+def test_unique_urls_keeps_first_seen_order():
+    urls = ["https://b.test/", "https://a.test/x", "http://www.b.test", "https://a.test/x/"]
+    assert unique_urls(urls) == ["https://b.test/", "https://a.test/x"]
+
+def test_warns_once_past_capacity(caplog):
+    seen = UrlSeenSet(capacity=10)
+    with caplog.at_level("WARNING", logger="osint.dedup"):
+        for i in range(30):
+            seen.add(f"https://a.test/{i}")
+    assert seen.count > 10
+    assert len([r for r in caplog.records if "capacity" in r.getMessage()]) == 1
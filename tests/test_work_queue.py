@@ -0,0 +1,81 @@
+import pytest
+import work_queue
+from work_queue import WorkQueue
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(work_queue.time, "time", clock.time)
+    return clock
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = WorkQueue(str(tmp_path / "queue.db"), visibility_timeout=60, max_attempts=2)
+    yield queue
+    queue.close()
+
+def test_enqueue_canonicalizes_and_ignores_duplicates(queue):
+    assert queue.enqueue(["+84 912 345 678", "+84912345678", "not a number", "+84987654321"]) == 2
+    assert queue.stats() == {"pending": 2}
+
+def test_lease_and_complete(queue):
+    queue.enqueue(["+84912345678"])
+    number = queue.lease("w1")
+    assert number == "+84912345678"
+    assert queue.lease("w2") is None
+    assert not queue.complete(number, "w2")
+    assert queue.complete(number, "w1", "results.json")
+    assert not queue.has_open_work()
+    assert list(queue.results()) == [("+84912345678", "done", "results.json", None)]
+
+def test_expired_lease_is_retried_by_another_worker(queue, clock):
+    queue.enqueue(["+84912345678"])
+    assert queue.lease("w1") == "+84912345678"
+    clock.now += 61
+    assert queue.lease("w2") == "+84912345678"
+    # The first worker's lease is gone; only the new holder may finish it
+    assert not queue.complete("+84912345678", "w1")
+    assert queue.complete("+84912345678", "w2")
+
+def test_expired_lease_fails_after_max_attempts(queue, clock):
+    queue.enqueue(["+84912345678"])
+    assert queue.lease("w1") == "+84912345678"
+    clock.now += 61
+    assert queue.lease("w2") == "+84912345678"
+    clock.now += 61
+    assert queue.lease("w3") is None
+    assert queue.stats() == {"failed": 1}
+    assert list(queue.results()) == [("+84912345678", "failed", None, "lease expired")]
+
+def test_fail_returns_number_until_max_attempts(queue):
+    queue.enqueue(["+84912345678"])
+    number = queue.lease("w1")
+    assert queue.fail(number, "w1", "timeout")
+    assert queue.stats() == {"pending": 1}
+    assert queue.lease("w1") == number
+    assert queue.fail(number, "w1", "timeout")
+    assert queue.stats() == {"failed": 1}
+    assert queue.lease("w1") is None
+
+def test_renew_keeps_a_long_task_leased(queue, clock):
+    queue.enqueue(["+84912345678"])
+    number = queue.lease("w1")
+    for _ in range(3):
+        clock.now += 40
+        assert queue.renew(number, "w1")
+    assert queue.lease("w2") is None
+    assert queue.complete(number, "w1")
+
+def test_renew_fails_once_the_lease_is_lost(queue, clock):
+    queue.enqueue(["+84912345678"])
+    number = queue.lease("w1")
+    clock.now += 61
+    assert queue.lease("w2") == number
+    assert not queue.renew(number, "w1")
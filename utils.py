@@ -7,28 +7,141 @@ from tqdm import tqdm
 from functools import wraps
 import aiohttp
 import signal
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import queue
+import json
+import random
+import atexit
+import multiprocessing
+import threading
+from collections import deque
+from urllib.parse import urlparse
 import psutil
 import gc
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+class AdaptiveRateLimiter:
+    """Token bucket with an adjustable concurrency limit, tuned by AIMD.
+
+    Each finished request is reported through ``release``. Fast successes
+    raise the rate and the concurrency limit additively. Throttling (429),
+    server errors, timeouts and very slow responses cut both
+    multiplicatively, so the limiter backs off when a service degrades and
+    ramps up again while it has headroom. Requests that were already in
+    flight at a cut report the same congestion, so their failures do not
+    cut again; ``release`` tells them apart by their latency.
+    """
+
+    def __init__(self, rate=0.5, burst=3, concurrency=2, min_rate=0.05, max_rate=5.0,
+                 max_concurrency=8, target_latency=3.0, increase=0.05, decrease=0.5):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = float(concurrency)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.tokens = float(burst)
+        self.in_flight = 0
+        self._updated = time.monotonic()
+        self._last_cut = float('-inf')
+        self._waiters = deque()
+
+    @property
+    def concurrency_limit(self):
+        return max(1, int(self.concurrency))
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
 
-class RateLimiter:
-    def __init__(self, calls_per_second=1, burst_limit=3):
-        self.calls_per_second = calls_per_second
-        self.burst_limit = burst_limit
-        self.calls = []
-        self.last_call = 0
-        
     async def acquire(self):
-        now = time.time()
-        self.calls = [t for t in self.calls if now - t <= 1.0]
-        
-        if len(self.calls) >= self.burst_limit:
-            sleep_time = self.calls[0] + 1.0 - now
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-        
-        self.calls.append(now)
-        self.last_call = now
+        """Wait for a concurrency slot and a token. Always pair with release()."""
+        while self.in_flight >= self.concurrency_limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+        # Reserve a token now; a negative balance is a debt later callers wait out
+        self._refill(time.monotonic())
+        wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+        self.tokens -= 1
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.tokens += 1
+                self._release_slot()
+                raise
+
+    def release(self, success, latency=None):
+        """Report a finished request and adapt the rate and concurrency limit."""
+        now = time.monotonic()
+        if not success or (latency is not None and latency > 2 * self.target_latency):
+            started = now - latency if latency is not None else now
+            if started >= self._last_cut:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.concurrency = max(1.0, self.concurrency * self.decrease)
+                self._last_cut = now
+        elif latency is None or latency <= self.target_latency:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+        self._release_slot()
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        free = self.concurrency_limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+class RateController:
+    """Keeps one AdaptiveRateLimiter per (engine, host) pair."""
+
+    def __init__(self, **limiter_options):
+        self.limiter_options = limiter_options
+        self.limiters = {}
+
+    def limiter(self, engine, url):
+        key = (engine, urlparse(url).netloc)
+        if key not in self.limiters:
+            self.limiters[key] = AdaptiveRateLimiter(**self.limiter_options)
+        return self.limiters[key]
+
+class SharedRateLimiter:
+    """Rate limiter whose budget is shared by every process holding it.
+
+    Each caller reserves the next free slot in a shared schedule, so N
+    worker processes together stay within ``calls_per_second``. Create it
+    in the parent and pass it to worker processes at start-up.
+    """
+
+    def __init__(self, calls_per_second=1, context=None):
+        context = context or multiprocessing.get_context()
+        self.interval = 1.0 / calls_per_second
+        self._next_slot = context.Value('d', 0.0, lock=False)
+        self._lock = context.Lock()
+
+    async def acquire(self):
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot.value)
+            self._next_slot.value = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
 class TimeoutError(Exception):
     pass
@@ -119,16 +232,113 @@ class AsyncSession:
         if self.session:
             await self.pool.release_connection(self.session)
 
-def setup_logging():
-    """Setup logging with file and console handlers."""
+@contextmanager
+def file_lock(f):
+    """Hold an exclusive lock on an open file, shared by every process.
+
+    Uses flock(2); where fcntl is unavailable (Windows) this does not lock,
+    so files shared between worker processes are only safe on POSIX.
+    """
+    if fcntl is None:
+        yield f
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        yield f
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def write_json_atomic(path, data):
+    """Write JSON to path so that readers see either the old or the new file."""
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_file, path)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+def update_json_file(path, key, value):
+    """Set one key of a JSON object file, safely across processes.
+
+    The read-modify-write runs under a lock on ``path + '.lock'`` and the
+    file is replaced atomically. An unreadable file is started afresh.
+    """
+    with open(f"{path}.lock", 'a') as lock_file, file_lock(lock_file):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except ValueError:
+            logging.getLogger('osint.cache').warning("Discarding unreadable cache file %s", path)
+            data = {}
+        data[key] = value
+        write_json_atomic(path, data)
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(),
+            'logger': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class DebugSampler(logging.Filter):
+    """Pass only a fraction of DEBUG records; other levels always pass."""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+class LazyQueueHandler(QueueHandler):
+    """QueueHandler that defers message formatting to the listener thread.
+
+    The stock handler merges ``msg % args`` before enqueueing, which puts the
+    formatting cost on the logging thread. Records are passed through as-is
+    instead; this is safe because the queue never leaves the process.
+    """
+
+    def prepare(self, record):
+        return record
+
+_listener = None
+
+def setup_logging(queued=False, structured=False, level=logging.INFO, debug_sample_rate=1.0):
+    """Setup logging with file and console handlers.
+
+    With ``queued=True`` the calling thread only enqueues records and a
+    background listener thread formats and writes them. ``structured=True``
+    writes JSON records, and ``debug_sample_rate`` keeps only that fraction
+    of DEBUG records. Calling this again returns the configured logger
+    without adding handlers.
+    """
+    global _listener
+
+    logger = logging.getLogger('osint')
+    if getattr(logger, '_osint_configured', False):
+        return logger
+
     log_dir = os.path.join(os.path.dirname(__file__), "logs")
     os.makedirs(log_dir, exist_ok=True)
     
     log_file = os.path.join(log_dir, f"osint_{datetime.now().strftime('%Y%m%d')}.log")
     
     # Create logger
-    logger = logging.getLogger('osint')
-    logger.setLevel(logging.INFO)
+    logger.setLevel(level)
     
     # Create handlers
     file_handler = RotatingFileHandler(
@@ -140,12 +350,61 @@ def setup_logging():
     console_handler = logging.StreamHandler()
     
     # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if structured:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
+    sampler = DebugSampler(debug_sample_rate)
+    
     # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    if queued:
+        log_queue = queue.SimpleQueue()
+        queue_handler = LazyQueueHandler(log_queue)
+        queue_handler.addFilter(sampler)
+        logger.addHandler(queue_handler)
+        _listener = QueueListener(log_queue, file_handler, console_handler)
+        _listener.start()
+        atexit.register(stop_logging)
+    else:
+        file_handler.addFilter(sampler)
+        console_handler.addFilter(sampler)
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
     
+    logger._osint_configured = True
+    return logger
+
+def setup_worker_logging(log_queue, level=logging.INFO):
+    """Send a worker process's log records to the parent through log_queue.
+
+    Records are formatted in the worker before being queued, since their
+    arguments may not survive pickling. The parent drains the queue with
+    ``forward_worker_logs``.
+    """
+    logger = logging.getLogger('osint')
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.setLevel(level)
+    logger.addHandler(QueueHandler(log_queue))
+    logger._osint_configured = True
     return logger
+
+class _ForwardHandler(logging.Handler):
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+def forward_worker_logs(log_queue):
+    """Start a listener that replays worker records into this process's loggers."""
+    listener = QueueListener(log_queue, _ForwardHandler())
+    listener.start()
+    return listener
+
+def stop_logging():
+    """Flush and stop the background log listener, if one is running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
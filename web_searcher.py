@@ -1,18 +1,38 @@
 import asyncio
+import atexit
 import aiohttp
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 from datetime import datetime
 from urllib.parse import quote_plus
 import time
-from utils import RateLimiter, AsyncRetry, AsyncSession, with_timeout, ConnectionPool, MemoryManager
+from utils import RateController, AsyncRetry, AsyncSession, with_timeout, ConnectionPool, MemoryManager
 import logging
 from tqdm import tqdm
+from phone_analyzer import PhoneContext
+from response_store import ResponseStore
+from url_dedup import unique_urls
+from records import SearchRecord
+
+# Shared by every WebSearcher in the process so learned per-host limits
+# carry over from one search to the next
+_rate_controller = RateController()
+_response_store = None
+
+def _shared_response_store():
+    # One store, and so one index connection, per process rather than per search
+    global _response_store
+    if _response_store is None:
+        _response_store = ResponseStore()
+        atexit.register(_response_store.close)
+    return _response_store
 
 class WebSearcher:
-    def __init__(self, cache_manager=None):
+    def __init__(self, cache_manager=None, response_store=None, rate_limiter=None, rate_controller=None,
+                 seen_urls=None):
         self.ua = UserAgent()
         self.cache_manager = cache_manager
+        self.response_store = response_store or _shared_response_store()
         self.current_proxy = 0
         self.session = None
         self.proxies = self._load_proxies()
@@ -22,11 +42,12 @@ class WebSearcher:
             'searx': 'https://searx.be/search'
         }
         self.logger = logging.getLogger('osint.websearcher')
-        self.rate_limiter = RateLimiter(calls_per_second=0.5, burst_limit=3)
+        self.rate_limiter = rate_limiter
+        self.rate_controller = rate_controller or _rate_controller
+        self.seen_urls = seen_urls
         self.session_manager = AsyncSession(timeout=30)
         self.connection_pool = ConnectionPool(size=5)
         self.memory_manager = MemoryManager(threshold=85)
-        self.batch_size = 3
 
     def _load_proxies(self):
         # Rotating proxies list (add your proxies here)
@@ -48,24 +69,44 @@ class WebSearcher:
             'DNT': '1',
         }
 
+    async def _fetch(self, url, engine):
+        # Rate limits are waited out here, outside the timeout and retries,
+        # so a long wait for a token does not count as a timed-out attempt
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        limiter = self.rate_controller.limiter(engine, url)
+        await limiter.acquire()
+        
+        start = time.monotonic()
+        success = False
+        try:
+            status, html = await self._fetch_with_retry(url, engine)
+            # Throttling and server errors count against the host; other statuses do not
+            success = status != 429 and status < 500
+            return html
+        finally:
+            limiter.release(success, time.monotonic() - start)
+
     @AsyncRetry(retries=3, delay=1, backoff=2)
     @with_timeout(30)
     async def _fetch_with_retry(self, url, engine):
-        await self.rate_limiter.acquire()
-        self.logger.debug(f"Fetching {url} with engine {engine}")
-        
+        self.logger.debug("Fetching %s with engine %s", url, engine)
         async with self.session_manager as session:
             proxy = self._get_next_proxy()
             async with session.get(url, headers=self._get_headers(), proxy=proxy) as response:
-                if response.status == 200:
-                    return await response.text()
-        return None
+                html = await response.text() if response.status == 200 else None
+                return response.status, html
 
-    async def _fetch_async(self, url, engine):
-        html = await self._fetch_with_retry(url, engine)
+    async def _fetch_async(self, url, engine, query=None):
+        html = await self._fetch(url, engine)
         if html:
+            try:
+                await asyncio.to_thread(self.response_store.put, url, engine, html, query)
+            except Exception as e:
+                # Losing the raw copy only affects reparse; keep the results
+                self.logger.warning("Could not store response for %s: %s", url, e)
             return self._parse_results(html, engine)
-        return []
+        return None
 
     def _parse_results(self, html, engine):
         soup = BeautifulSoup(html, 'html.parser')
@@ -109,52 +150,97 @@ class WebSearcher:
         for url in urls:
             if not any(x in url.lower() for x in blacklist):
                 cleaned.append(url)
-        return list(dict.fromkeys(cleaned))  # Remove duplicates
+        return unique_urls(cleaned)  # Remove duplicates, including trivial URL variants
 
-    async def search_all_engines(self, query):
-        if cached := await self._get_cached_results(query):
-            return cached
+    async def search_all_engines(self, query, use_cache=True):
+        """Search every engine and return a SearchRecord.
 
-        results = []
-        engines = list(self.additional_sites.items())
+        Returns None, and caches nothing, when no engine returned a page, so
+        an outage is not mistaken for a number with no results.
+        """
+        # Phone contexts are searched and cached under their E.164 form
+        if isinstance(query, PhoneContext):
+            query = query.e164
+
+        if use_cache and (cached := await self._get_cached_results(query)):
+            return self._drop_seen(SearchRecord.from_dict(cached))
+
+        # Every engine is queried at once; per-host limiters pace the requests
+        tasks = [
+            self._fetch_async(self._build_url(base_url, query), engine, query)
+            for engine, base_url in self.additional_sites.items()
+        ]
+        engine_results = await asyncio.gather(*tasks, return_exceptions=True)
+        valid_results = [r for r in engine_results if r is not None and not isinstance(r, Exception)]
+        if not valid_results:
+            self.logger.warning("No search engine returned results for %s", query)
+            return None
+        results = [item for sublist in valid_results for item in sublist]
         
-        # Process in batches
-        for i in range(0, len(engines), self.batch_size):
-            batch = engines[i:i + self.batch_size]
-            batch_tasks = []
-            
-            for engine, base_url in batch:
-                url = f"{base_url}?q={quote_plus(query)}"
-                task = self._fetch_async(url, engine)
-                batch_tasks.append(task)
-            
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            valid_results = [r for r in batch_results if not isinstance(r, Exception)]
-            results.extend([item for sublist in valid_results for item in sublist])
-            
-            if self.memory_manager.check_memory():
-                self.logger.info("Memory threshold reached, performing cleanup")
-            
-            await asyncio.sleep(0.5)
+        if self.memory_manager.check_memory():
+            self.logger.info("Memory threshold reached, performing cleanup")
         
-        # Format results before returning
-        formatted_results = {
-            'search_results': list(dict.fromkeys(results))[:20],  # Top 20 unique results
-            'search_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        formatted_results = self._format_results(results)
         
         if self.cache_manager:
             await self._cache_results(query, formatted_results)
         
+        return self._drop_seen(formatted_results)
+
+    async def reparse(self, query):
+        """Rebuild search results for a query from stored raw responses.
+
+        No network requests are made; engines without a stored response are
+        skipped. Returns None if nothing was stored for the query.
+        """
+        if isinstance(query, PhoneContext):
+            query = query.e164
+
+        results = []
+        found = False
+        for engine, base_url in self.additional_sites.items():
+            entry = self.response_store.latest(self._build_url(base_url, query))
+            if not entry:
+                continue
+            html = await asyncio.to_thread(self.response_store.get, entry['digest'])
+            if html is None:
+                continue
+            found = True
+            results.extend(self._parse_results(html, engine))
+
+        if not found:
+            return None
+
+        formatted_results = self._format_results(results)
+        if self.cache_manager:
+            await self._cache_results(query, formatted_results)
         return formatted_results
 
+    def _build_url(self, base_url, query):
+        return f"{base_url}?q={quote_plus(query)}"
+
+    def _drop_seen(self, formatted_results):
+        """Remove URLs already reported earlier in the batch, if a seen-set is in use."""
+        if self.seen_urls is None:
+            return formatted_results
+        return SearchRecord(
+            [url for url in formatted_results.urls if self.seen_urls.add(url)],
+            formatted_results.search_time
+        )
+
+    def _format_results(self, results):
+        return SearchRecord(
+            unique_urls(results)[:20],  # Top 20 unique results
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
+
     async def _get_cached_results(self, query):
         if self.cache_manager:
             return await asyncio.to_thread(self.cache_manager.get, query, 'search')
         return None
 
     async def _cache_results(self, query, results):
-        await asyncio.to_thread(self.cache_manager.set, query, results, 'search')
+        await asyncio.to_thread(self.cache_manager.set, query, results.to_dict(), 'search')
 
     async def __aenter__(self):
         await self.session_manager.__aenter__()
@@ -164,7 +250,7 @@ class WebSearcher:
         try:
             await self.session_manager.__aexit__(exc_type, exc_val, exc_tb)
         except Exception as e:
-            self.logger.error(f"Error closing session: {e}")
+            self.logger.error("Error closing session: %s", e)
         finally:
             if self.session:
                 await self.session.close()
@@ -192,11 +278,12 @@ def find_related_info(phone_number):
     all_results = []
     for query in queries:
         results = loop.run_until_complete(searcher.search_all_engines(query))
-        all_results.extend(results)
+        if results:
+            all_results.extend(results.urls)
         time.sleep(1)  # Respect rate limits
     
     # Group and clean results
-    return {
-        'search_results': list(dict.fromkeys(all_results))[:20],  # Top 20 unique results
-        'search_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    return SearchRecord(
+        unique_urls(all_results)[:20],  # Top 20 unique results
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    )
@@ -0,0 +1,239 @@
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+from cache_manager import CacheManager
+from phone_analyzer import create_context
+from utils import setup_worker_logging, forward_worker_logs
+
+class WorkQueue:
+    """Shared backlog of numbers coordinated through a SQLite file.
+
+    Workers lease numbers for ``visibility_timeout`` seconds and renew the
+    lease while they work. A lease that is neither renewed, completed nor
+    failed in time becomes available again, so numbers held by a crashed
+    worker are retried. A number is marked failed after
+    ``max_attempts`` leases. To spread workers across hosts, put the database
+    on storage they all reach; the rollback journal is kept, since WAL mode
+    does not work over network filesystems.
+    """
+
+    def __init__(self, db_file, visibility_timeout=300, max_attempts=3):
+        self.db_file = db_file
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                number TEXT UNIQUE NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                results_file TEXT,
+                error TEXT,
+                updated_at REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_expires)")
+
+    def enqueue(self, numbers):
+        """Add numbers to the backlog in canonical form; returns how many were new."""
+        added = 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for number in numbers:
+                    context = create_context(number)
+                    if context is None:
+                        continue
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO tasks (number, updated_at) VALUES (?, ?)",
+                        (context.e164, time.time())
+                    )
+                    added += cursor.rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def lease(self, worker_id):
+        """Lease the next available number to worker_id, or return None."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases that have used up their attempts are given up on
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'failed', error = 'lease expired', lease_owner = NULL, updated_at = ? "
+                    "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, now, self.max_attempts)
+                )
+                row = self._conn.execute(
+                    "SELECT id, number FROM tasks "
+                    "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                    "ORDER BY id LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                        "lease_expires = ?, updated_at = ? WHERE id = ?",
+                        (worker_id, now + self.visibility_timeout, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row[1] if row else None
+
+    def renew(self, number, worker_id):
+        """Extend a lease by another visibility_timeout. Returns False if it was lost."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                "WHERE number = ? AND status = 'leased' AND lease_owner = ?",
+                (now + self.visibility_timeout, now, number, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, number, worker_id, results_file=None):
+        """Mark a leased number done. Returns False if the lease was lost."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'done', results_file = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? "
+                "WHERE number = ? AND status = 'leased' AND lease_owner = ?",
+                (results_file, time.time(), number, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, number, worker_id, error):
+        """Release a leased number for retry, or mark it failed after max_attempts."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE number = ? AND status = 'leased' AND lease_owner = ?",
+                (self.max_attempts, error, time.time(), number, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def has_open_work(self):
+        """True while any number is pending or leased."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM tasks WHERE status IN ('pending', 'leased') LIMIT 1"
+            ).fetchone()
+        return row is not None
+
+    def stats(self):
+        """Return a mapping of status to number count."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return dict(rows)
+
+    def results(self):
+        """Yield (number, status, results_file, error) for finished numbers in backlog order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT number, status, results_file, error FROM tasks "
+                "WHERE status IN ('done', 'failed') ORDER BY id"
+            ).fetchall()
+        yield from rows
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+async def run_queue_worker(db_file, worker_id=None, poll_interval=5):
+    """Lease numbers from the work queue and analyze them until it drains.
+
+    While other workers still hold leases, keep polling so that numbers they
+    abandon are picked up once their leases expire. The lease on the number
+    being analyzed is renewed every third of the visibility timeout.
+    """
+    # Imported lazily: main imports this module
+    from main import run_analysis
+
+    logger = logging.getLogger('osint.workqueue')
+    worker_id = worker_id or default_worker_id()
+    work_queue = WorkQueue(db_file)
+    cache_manager = CacheManager()
+    processed = 0
+    try:
+        while True:
+            number = await asyncio.to_thread(work_queue.lease, worker_id)
+            if number is None:
+                if not await asyncio.to_thread(work_queue.has_open_work):
+                    break
+                await asyncio.sleep(poll_interval)
+                continue
+            heartbeat = asyncio.create_task(_keep_leased(work_queue, number, worker_id))
+            try:
+                results_file = await run_analysis(number, cache_manager)
+            except Exception as e:
+                logger.error("Error during analysis of %s: %s", number, e)
+                await asyncio.to_thread(work_queue.fail, number, worker_id, str(e))
+                continue
+            finally:
+                heartbeat.cancel()
+            if await asyncio.to_thread(work_queue.complete, number, worker_id, results_file):
+                processed += 1
+            else:
+                logger.warning("Lease on %s expired before completion", number)
+    finally:
+        work_queue.close()
+    logger.info("Worker %s finished after %s numbers", worker_id, processed)
+    return processed
+
+async def _keep_leased(work_queue, number, worker_id):
+    interval = work_queue.visibility_timeout / 3
+    while True:
+        await asyncio.sleep(interval)
+        if not await asyncio.to_thread(work_queue.renew, number, worker_id):
+            logging.getLogger('osint.workqueue').warning("Lost the lease on %s", number)
+            return
+
+def _queue_worker_main(db_file, log_queue):
+    setup_worker_logging(log_queue)
+    # As with sharded workers, per-number reports from several processes
+    # would interleave on the terminal; logs still reach the parent
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        asyncio.run(run_queue_worker(db_file))
+
+def run_queue_workers(db_file, workers=1):
+    """Run queue workers on this host: in-process for one, else one per process."""
+    if workers <= 1:
+        asyncio.run(run_queue_worker(db_file))
+        return
+    context = multiprocessing.get_context('spawn')
+    log_queue = context.Queue()
+    log_listener = forward_worker_logs(log_queue)
+    processes = [
+        context.Process(target=_queue_worker_main, args=(db_file, log_queue))
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    finally:
+        log_listener.stop()